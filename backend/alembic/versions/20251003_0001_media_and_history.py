@@ -8,10 +8,27 @@ branch_labels = None
 depends_on = None
 
 
+def _missing(table: str) -> bool:
+    # Stamp'lenmemiş eski veritabanlarında bu tablolar create_tables() ile zaten oluşturulmuş olabilir
+    return not sa.inspect(op.get_bind()).has_table(table)
+
+
 def upgrade() -> None:
     op.execute("CREATE EXTENSION IF NOT EXISTS pgcrypto;")
 
-    # donation_broadcast_participation
+    if _missing('donation_broadcast_participation'):
+        _create_participation()
+    if _missing('media_assets'):
+        _create_media_assets()
+    if _missing('media_delivery'):
+        _create_media_delivery()
+    if _missing('media_packages'):
+        _create_media_packages()
+    if _missing('media_package_items'):
+        _create_media_package_items()
+
+
+def _create_participation() -> None:
     op.create_table(
         'donation_broadcast_participation',
         sa.Column('id', sa.UUID(), primary_key=True, server_default=sa.text('gen_random_uuid()')),
@@ -23,7 +40,8 @@ def upgrade() -> None:
     op.create_unique_constraint('uq_dbp_user_donation_broadcast', 'donation_broadcast_participation', ['user_id', 'donation_id', 'broadcast_id'])
     op.create_index('idx_dbp_user_joined_at', 'donation_broadcast_participation', ['user_id', 'joined_at'], unique=False, postgresql_using=None)
 
-    # media_assets
+
+def _create_media_assets() -> None:
     op.create_table(
         'media_assets',
         sa.Column('id', sa.UUID(), primary_key=True, server_default=sa.text('gen_random_uuid()')),
@@ -44,7 +62,8 @@ def upgrade() -> None:
     op.create_check_constraint('ck_media_assets_status', 'media_assets', "status IN ('uploaded','review','approved','rejected')")
     op.create_index('idx_media_assets_owner_status_created', 'media_assets', ['status', 'owner_donation_id', sa.text('created_at DESC')], unique=False)
 
-    # media_delivery
+
+def _create_media_delivery() -> None:
     op.create_table(
         'media_delivery',
         sa.Column('id', sa.UUID(), primary_key=True, server_default=sa.text('gen_random_uuid()')),
@@ -56,7 +75,8 @@ def upgrade() -> None:
     op.create_unique_constraint('uq_media_delivery_donation_asset', 'media_delivery', ['donation_id', 'media_asset_id'])
     op.create_index('idx_media_delivery_donation_delivered', 'media_delivery', ['donation_id', sa.text('delivered_at DESC')], unique=False)
 
-    # media_packages
+
+def _create_media_packages() -> None:
     op.create_table(
         'media_packages',
         sa.Column('id', sa.UUID(), primary_key=True, server_default=sa.text('gen_random_uuid()')),
@@ -70,7 +90,8 @@ def upgrade() -> None:
     )
     op.create_check_constraint('ck_media_packages_status', 'media_packages', "status IN ('draft','published')")
 
-    # media_package_items
+
+def _create_media_package_items() -> None:
     op.create_table(
         'media_package_items',
         sa.Column('id', sa.UUID(), primary_key=True, server_default=sa.text('gen_random_uuid()')),
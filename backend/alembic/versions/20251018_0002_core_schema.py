@@ -0,0 +1,161 @@
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '20251018_0002'
+down_revision = '20251003_0001'
+branch_labels = None
+depends_on = None
+
+
+# Daha önce app açılışında create_tables() ile oluşturulan çekirdek şema.
+# Mevcut veritabanlarında tablolar zaten var; bu yüzden tüm ifadeler IF NOT EXISTS.
+CORE_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+        name VARCHAR(100) NOT NULL,
+        surname VARCHAR(100) NOT NULL,
+        email VARCHAR(255) UNIQUE,
+        phone VARCHAR(20) UNIQUE NOT NULL,
+        password_hash VARCHAR(255) NOT NULL,
+        role VARCHAR(50) DEFAULT 'user',
+        is_admin BOOLEAN DEFAULT FALSE,
+        is_super_admin BOOLEAN DEFAULT FALSE,
+        is_active BOOLEAN DEFAULT TRUE,
+        email_verified BOOLEAN DEFAULT FALSE,
+        phone_verified BOOLEAN DEFAULT FALSE,
+        last_login TIMESTAMP,
+        created_at TIMESTAMP DEFAULT NOW(),
+        updated_at TIMESTAMP DEFAULT NOW()
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS donations (
+        id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+        user_id UUID REFERENCES users(id) ON DELETE CASCADE,
+        amount DECIMAL(10,2) NOT NULL,
+        donor_name VARCHAR(100) NOT NULL,
+        donor_phone VARCHAR(20),
+        donor_email VARCHAR(255),
+        payment_method VARCHAR(50),
+        payment_status VARCHAR(50) DEFAULT 'pending',
+        payment_reference VARCHAR(255),
+        payment_date TIMESTAMP,
+        notes TEXT,
+        created_at TIMESTAMP DEFAULT NOW(),
+        updated_at TIMESTAMP DEFAULT NOW()
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS streams (
+        id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+        user_id UUID REFERENCES users(id) ON DELETE CASCADE,
+        admin_id UUID REFERENCES users(id),
+        title VARCHAR(200) NOT NULL,
+        description TEXT,
+        status VARCHAR(50) DEFAULT 'scheduled',
+        scheduled_at TIMESTAMP,
+        started_at TIMESTAMP,
+        ended_at TIMESTAMP,
+        duration_minutes INTEGER,
+        room_name VARCHAR(100),
+        participant_count INTEGER DEFAULT 0,
+        max_participants INTEGER DEFAULT 100,
+        created_at TIMESTAMP DEFAULT NOW(),
+        updated_at TIMESTAMP DEFAULT NOW()
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS certificates (
+        id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+        user_id UUID REFERENCES users(id) ON DELETE CASCADE,
+        donation_id UUID REFERENCES donations(id),
+        stream_id UUID REFERENCES streams(id),
+        certificate_type VARCHAR(50) NOT NULL,
+        certificate_data JSONB,
+        pdf_path VARCHAR(500),
+        qr_code VARCHAR(500),
+        verification_code VARCHAR(100) UNIQUE,
+        is_verified BOOLEAN DEFAULT FALSE,
+        verified_at TIMESTAMP,
+        created_at TIMESTAMP DEFAULT NOW()
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS notifications (
+        id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+        user_id UUID REFERENCES users(id) ON DELETE CASCADE,
+        title VARCHAR(200) NOT NULL,
+        message TEXT NOT NULL,
+        notification_type VARCHAR(50),
+        channel VARCHAR(50),
+        status VARCHAR(50) DEFAULT 'pending',
+        sent_at TIMESTAMP,
+        read_at TIMESTAMP,
+        created_at TIMESTAMP DEFAULT NOW()
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS user_sessions (
+        id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+        user_id UUID REFERENCES users(id) ON DELETE CASCADE,
+        session_token VARCHAR(500) UNIQUE NOT NULL,
+        expires_at TIMESTAMP NOT NULL,
+        created_at TIMESTAMP DEFAULT NOW()
+    )
+    """,
+    # Önceden /user/push-token isteği başına oluşturuluyordu
+    """
+    CREATE TABLE IF NOT EXISTS user_push_tokens (
+        id VARCHAR(255) PRIMARY KEY,
+        user_id UUID NOT NULL REFERENCES users(id),
+        expo_push_token VARCHAR(500) NOT NULL,
+        platform VARCHAR(50) NOT NULL,
+        created_at TIMESTAMP DEFAULT NOW(),
+        updated_at TIMESTAMP DEFAULT NOW()
+    )
+    """,
+]
+
+# Router'ların kullandığı fakat create_tables()'ta hiç tanımlanmamış kolonlar
+EXTRA_COLUMNS = [
+    "ALTER TABLE streams ADD COLUMN IF NOT EXISTS channel VARCHAR(200)",
+    "ALTER TABLE streams ADD COLUMN IF NOT EXISTS kurban_id VARCHAR(100)",
+    "ALTER TABLE streams ADD COLUMN IF NOT EXISTS user_name VARCHAR(200)",
+    "ALTER TABLE streams ADD COLUMN IF NOT EXISTS kurban_type VARCHAR(50)",
+    "ALTER TABLE streams ADD COLUMN IF NOT EXISTS location VARCHAR(200)",
+    "ALTER TABLE streams ADD COLUMN IF NOT EXISTS animal_count INTEGER",
+    "ALTER TABLE streams ADD COLUMN IF NOT EXISTS viewers INTEGER DEFAULT 0",
+    "ALTER TABLE streams ADD COLUMN IF NOT EXISTS duration VARCHAR(20)",
+    "ALTER TABLE streams ADD COLUMN IF NOT EXISTS target_amount DECIMAL(10,2)",
+    "ALTER TABLE donations ADD COLUMN IF NOT EXISTS status VARCHAR(50)",
+    "ALTER TABLE donations ADD COLUMN IF NOT EXISTS transaction_id VARCHAR(255)",
+]
+
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)",
+    "CREATE INDEX IF NOT EXISTS idx_users_phone ON users(phone)",
+    "CREATE INDEX IF NOT EXISTS idx_users_role ON users(role)",
+    "CREATE INDEX IF NOT EXISTS idx_donations_user_id ON donations(user_id)",
+    "CREATE INDEX IF NOT EXISTS idx_donations_status ON donations(payment_status)",
+    "CREATE INDEX IF NOT EXISTS idx_donations_created_at ON donations(created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_streams_user_id ON streams(user_id)",
+    "CREATE INDEX IF NOT EXISTS idx_streams_status ON streams(status)",
+    "CREATE INDEX IF NOT EXISTS idx_streams_scheduled_at ON streams(scheduled_at)",
+    "CREATE INDEX IF NOT EXISTS idx_certificates_user_id ON certificates(user_id)",
+    "CREATE INDEX IF NOT EXISTS idx_certificates_verification_code ON certificates(verification_code)",
+    "CREATE INDEX IF NOT EXISTS idx_notifications_user_id ON notifications(user_id)",
+    "CREATE INDEX IF NOT EXISTS idx_notifications_status ON notifications(status)",
+    "CREATE INDEX IF NOT EXISTS idx_user_push_tokens_user_id ON user_push_tokens(user_id, updated_at DESC)",
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pgcrypto;")
+    for statement in CORE_TABLES + EXTRA_COLUMNS + INDEXES:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    # Çekirdek tablolar veri taşıdığı için geri alınmaz; yalnızca bu revizyonun indexleri kaldırılır
+    op.execute("DROP INDEX IF EXISTS idx_user_push_tokens_user_id")
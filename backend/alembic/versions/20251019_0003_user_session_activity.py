@@ -0,0 +1,27 @@
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '20251019_0003'
+down_revision = '20251018_0002'
+branch_labels = None
+depends_on = None
+
+
+# Presence Redis'te tutulur; user_sessions'a write-behind ile toplu yazılır.
+# admin list_users'ın beklediği kolonlar hiç oluşturulmamıştı.
+STATEMENTS = [
+    "ALTER TABLE user_sessions ADD COLUMN IF NOT EXISTS started_at TIMESTAMP DEFAULT NOW()",
+    "ALTER TABLE user_sessions ADD COLUMN IF NOT EXISTS last_activity TIMESTAMP",
+    "CREATE INDEX IF NOT EXISTS idx_user_sessions_user_expires ON user_sessions(user_id, expires_at DESC)",
+]
+
+
+def upgrade() -> None:
+    for statement in STATEMENTS:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_user_sessions_user_expires")
+    op.execute("ALTER TABLE user_sessions DROP COLUMN IF EXISTS last_activity")
+    op.execute("ALTER TABLE user_sessions DROP COLUMN IF EXISTS started_at")
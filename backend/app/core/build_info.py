@@ -0,0 +1,63 @@
+import hashlib
+import os
+import time
+from datetime import datetime, timezone
+from typing import Dict
+
+from .config import settings
+
+try:
+    # Image build'inde scripts/write_build_info.py ile üretilir
+    from .. import _build_info
+except ImportError:
+    _build_info = None
+
+
+def _build_value(name: str, env: str, default: str) -> str:
+    """Önce üretilmiş modül, yoksa ortam değişkeni (image dışı çalıştırma)"""
+    return getattr(_build_info, name, None) or os.getenv(env) or default
+
+
+VERSION = _build_value("VERSION", "APP_VERSION", "1.0.0")
+GIT_SHA = _build_value("GIT_SHA", "GIT_SHA", "unknown")
+BUILD_TIME = _build_value("BUILD_TIME", "BUILD_TIME", "unknown")
+
+# Worker süreci başına açılış zamanı
+STARTED_AT = time.time()
+
+# Gizli değer taşıyan ayarlar özete girmez: /version kimlik doğrulamasız ve kısa bir
+# özet, bilinen aday değerlere karşı (ör. varsayılan SECRET_KEY) denenebilir
+SECRET_FIELDS = {
+    "DATABASE_URL",
+    "DATABASE_REPLICA_URL",
+    "REDIS_URL",
+    "SECRET_KEY",
+    "JWT_KEYS_DIR",
+    "EXPO_ACCESS_TOKEN",
+}
+
+
+def config_hash(values) -> str:
+    """Gizli olmayan ayarların özeti: worker'lar arası konfigürasyon farkını görmek için"""
+    return hashlib.sha256(values.model_dump_json(exclude=SECRET_FIELDS).encode()).hexdigest()[:12]
+
+
+CONFIG_HASH = config_hash(settings)
+
+
+def version_info() -> Dict:
+    """/version yanıtı; tamamı bellekten, istek başına süreç/IO yok"""
+    now = time.time()
+    return {
+        "version": VERSION,
+        "git_hash": GIT_SHA[:8],
+        "git_sha": GIT_SHA,
+        "build_time": BUILD_TIME,
+        "environment": os.getenv("ENV", "development"),
+        "profile": settings.APP_PROFILE,
+        "pid": os.getpid(),
+        "started_at": datetime.fromtimestamp(STARTED_AT, timezone.utc).isoformat(),
+        "uptime": int(now - STARTED_AT),
+        "config_hash": CONFIG_HASH,
+        "timestamp": int(now),
+    }
@@ -0,0 +1,144 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from .metrics import metrics
+from .redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Süreç içi, thread-safe TTL + LRU önbellek"""
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING or entry[0] <= now:
+                if entry is not _MISSING:
+                    del self._data[key]
+                value = _MISSING
+            else:
+                self._data.move_to_end(key)
+                value = entry[1]
+        metrics.incr(f"cache.{self.name}.{'miss' if value is _MISSING else 'hit'}")
+        return default if value is _MISSING else value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# ---------- Worker'lar arası invalidation (Redis pub/sub) ----------
+INVALIDATION_PREFIX = "cache:invalidate:"
+
+_caches: Dict[str, TTLCache] = {}
+# Önbellek dışı yayınlar (ör. token iptali) aynı pub/sub bağlantısını paylaşır
+_channels: Dict[str, Callable[[str], None]] = {}
+_resync: Dict[str, Callable[[], None]] = {}
+_listener = None
+
+
+def register_cache(cache: TTLCache) -> TTLCache:
+    """Önbelleği pub/sub invalidation'a kaydet"""
+    _caches[cache.name] = cache
+    return cache
+
+
+def register_channel(channel: str, handler: Callable[[str], None],
+                     resync: Optional[Callable[[], None]] = None) -> None:
+    """Dinleyiciye ek kanal ekle; bağlantı koparsa resync çağrılır"""
+    _channels[channel] = handler
+    if resync is not None:
+        _resync[channel] = resync
+
+
+def _evict(cache: TTLCache, key: str) -> None:
+    if key == "*":
+        cache.clear()
+    else:
+        cache.delete(key)
+
+
+def invalidate(name: str, key: str = "*") -> None:
+    """Yerelde hemen sil, diğer worker'lara Redis üzerinden duyur ("*" = tümü)"""
+    cache = _caches.get(name)
+    if cache is not None:
+        _evict(cache, key)
+    try:
+        get_redis().publish(f"{INVALIDATION_PREFIX}{name}", key)
+    except Exception as e:
+        # Redis yoksa diğer worker'lar TTL dolunca güncellenir
+        logger.warning(f"Cache invalidation yayınlanamadı ({name}:{key}): {e}")
+
+
+def _on_message(message) -> None:
+    name = message["channel"][len(INVALIDATION_PREFIX):]
+    cache = _caches.get(name)
+    if cache is None:
+        return
+    _evict(cache, message["data"])
+    metrics.incr(f"cache.{name}.remote_invalidation")
+
+
+def _on_listener_error(error, pubsub, thread) -> None:
+    # Bağlantı koptuysa kaçırılan mesajlar olabilir: güvenli taraf için tümünü temizle
+    logger.warning(f"Cache invalidation dinleyici hatası: {error}")
+    for cache in _caches.values():
+        cache.clear()
+    for channel, resync in _resync.items():
+        try:
+            resync()
+        except Exception as e:
+            logger.warning(f"{channel} yeniden senkronize edilemedi: {e}")
+    time.sleep(1)
+
+
+def start_invalidation_listener() -> None:
+    """Kayıtlı önbellekler için arka plan pub/sub dinleyicisi başlat"""
+    global _listener
+    if _listener is not None or not (_caches or _channels):
+        return
+    try:
+        pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+        handlers = {f"{INVALIDATION_PREFIX}{name}": _on_message for name in _caches}
+        for channel, handler in _channels.items():
+            handlers[channel] = lambda message, handler=handler: handler(message["data"])
+        pubsub.subscribe(**handlers)
+        _listener = pubsub.run_in_thread(sleep_time=1.0, daemon=True, exception_handler=_on_listener_error)
+    except Exception as e:
+        logger.warning(f"Cache invalidation dinleyicisi başlatılamadı, yalnızca TTL geçerli: {e}")
+
+
+def stop_invalidation_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
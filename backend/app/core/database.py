@@ -0,0 +1,245 @@
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from .config import settings
+from .metrics import metrics
+from .query_budget import LOCK_NOT_AVAILABLE, QUERY_CANCELED, current_budget, mark_exceeded
+
+logger = logging.getLogger(__name__)
+
+
+class _CheckoutTimingMixin:
+    """Checkout bekleme süresini ve timeout'ları ölçen pool eklentisi"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            metrics.incr(f"db.pool.{self.logging_name}.checkout_timeout")
+            raise
+        finally:
+            metrics.observe(f"db.pool.{self.logging_name}.checkout_wait", time.perf_counter() - start)
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+_engines: Dict[str, Engine] = {}
+_async_engines: Dict[str, AsyncEngine] = {}
+_sessionmakers: Dict[str, sessionmaker] = {}
+_lock = threading.Lock()
+
+
+def _engine_url(name: str) -> str:
+    urls = {"primary": settings.DATABASE_URL}
+    if settings.DATABASE_REPLICA_URL:
+        urls["replica"] = settings.DATABASE_REPLICA_URL
+    if name not in urls:
+        raise KeyError(f"Tanımsız veritabanı engine'i: {name}")
+    return urls[name]
+
+
+def _pool_options(name: str) -> Dict:
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_logging_name": name,
+    }
+
+
+def _apply_query_budget(dbapi_connection, connection_record, connection_proxy):
+    """Checkout'ta isteğin bütçesini uygula; bağlantıda zaten aynıysa round-trip yapma"""
+    budget = current_budget()
+    applied = (budget.statement_timeout_ms, budget.lock_timeout_ms)
+    if connection_record.info.get("query_budget") == applied:
+        return
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(
+            f"SELECT set_config('statement_timeout', '{budget.statement_timeout_ms}', false), "
+            f"set_config('lock_timeout', '{budget.lock_timeout_ms}', false)"
+        )
+    finally:
+        cursor.close()
+    # Oturum seviyesindeki ayar, içinde yapıldığı transaction rollback olursa geri alınır
+    dbapi_connection.commit()
+    connection_record.info["query_budget"] = applied
+
+
+def _flag_budget_exceeded(exception_context):
+    original = exception_context.original_exception
+    pgcode = getattr(original, "pgcode", None) or getattr(original, "sqlstate", None)
+    if pgcode in (QUERY_CANCELED, LOCK_NOT_AVAILABLE):
+        mark_exceeded(pgcode)
+
+
+def _install_budget_events(engine: Engine) -> None:
+    event.listen(engine, "checkout", _apply_query_budget)
+    event.listen(engine, "handle_error", _flag_budget_exceeded)
+
+
+def _create_engine(name: str, url: str) -> Engine:
+    if url.startswith("sqlite"):
+        # SQLite (lokal/test) kendi pool'unu kullanır
+        return create_engine(url, connect_args={"check_same_thread": False})
+    engine = create_engine(url, poolclass=InstrumentedQueuePool, **_pool_options(name))
+    _install_budget_events(engine)
+    return engine
+
+
+def _async_url(url: str) -> str:
+    """Sync sürücü URL'ini async karşılığına çevir (psycopg2 -> asyncpg)"""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "postgresql":
+        parsed = parsed.set(drivername="postgresql+asyncpg")
+    elif parsed.get_backend_name() == "sqlite":
+        parsed = parsed.set(drivername="sqlite+aiosqlite")
+    return parsed.render_as_string(hide_password=False)
+
+
+def get_engine(name: str = "primary") -> Engine:
+    """Süreç başına tek engine döndür (ilk kullanımda oluşturulur)"""
+    engine = _engines.get(name)
+    if engine is None:
+        with _lock:
+            engine = _engines.get(name)
+            if engine is None:
+                engine = _engines[name] = _create_engine(name, _engine_url(name))
+    return engine
+
+
+def get_async_engine(name: str = "primary") -> AsyncEngine:
+    """Event loop'u bloklamayan async engine (asyncpg) döndür"""
+    engine = _async_engines.get(name)
+    if engine is None:
+        with _lock:
+            engine = _async_engines.get(name)
+            if engine is None:
+                url = _async_url(_engine_url(name))
+                if url.startswith("sqlite"):
+                    engine = create_async_engine(url)
+                else:
+                    engine = create_async_engine(
+                        url, poolclass=InstrumentedAsyncQueuePool, **_pool_options(f"{name}_async")
+                    )
+                    _install_budget_events(engine.sync_engine)
+                _async_engines[name] = engine
+    return engine
+
+
+def get_sessionmaker(name: str = "primary") -> sessionmaker:
+    """Paylaşılan engine'e bağlı session factory"""
+    factory = _sessionmakers.get(name)
+    if factory is None:
+        factory = _sessionmakers[name] = sessionmaker(bind=get_engine(name), autoflush=False, autocommit=False)
+    return factory
+
+
+# Replica gecikmesi (saniye); WAL tamamen uygulanmışsa 0. Sunucu recovery'de değilse
+# (bağımsız bir Postgres ya da promote edilmiş eski replica) primary'yi izlemiyordur: NULL.
+REPLICA_LAG_QUERY = text(
+    """
+    SELECT CASE
+      WHEN NOT pg_is_in_recovery() THEN NULL
+      WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+      ELSE COALESCE(EXTRACT(EPOCH FROM NOW() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+_replica_lag: Optional[float] = None
+_replica_checked_at = 0.0
+_replica_lock = threading.Lock()
+
+
+def replica_lag() -> Optional[float]:
+    """Önbellekli replica gecikmesi; replica yoksa, ulaşılamıyorsa veya recovery'de değilse None"""
+    global _replica_lag, _replica_checked_at
+    if not settings.DATABASE_REPLICA_URL:
+        return None
+    if time.monotonic() - _replica_checked_at < settings.REPLICA_LAG_CHECK_INTERVAL:
+        return _replica_lag
+    with _replica_lock:
+        if time.monotonic() - _replica_checked_at < settings.REPLICA_LAG_CHECK_INTERVAL:
+            return _replica_lag
+        try:
+            with get_engine("replica").connect() as conn:
+                lag = conn.execute(REPLICA_LAG_QUERY).scalar()
+            if lag is None:
+                logger.warning("DATABASE_REPLICA_URL recovery modunda değil; okumalar primary'ye yönlendiriliyor")
+                metrics.incr("db.replica.not_in_recovery")
+                _replica_lag = None
+            else:
+                _replica_lag = float(lag)
+        except Exception as e:
+            logger.warning(f"Replica lag check error: {e}")
+            metrics.incr("db.replica.unavailable")
+            _replica_lag = None
+        _replica_checked_at = time.monotonic()
+    return _replica_lag
+
+
+def get_read_engine(max_lag: Optional[float] = None) -> Engine:
+    """Salt-okunur sorgular için engine: replica yeterince güncelse replica, aksi halde primary.
+
+    max_lag verilmezse REPLICA_MAX_LAG_SECONDS kullanılır; tazelik kritikse max_lag=0
+    okumayı primary'de tutar.
+    """
+    if max_lag is None:
+        max_lag = settings.REPLICA_MAX_LAG_SECONDS
+    lag = replica_lag() if max_lag > 0 else None
+    if lag is None or lag > max_lag:
+        metrics.incr("db.read.primary")
+        return get_engine()
+    metrics.incr("db.read.replica")
+    return get_engine("replica")
+
+
+def pool_stats() -> Dict:
+    """Her engine için pool doluluk ve bekleme istatistikleri"""
+    stats = {}
+    engines = [(name, engine.pool) for name, engine in _engines.items()]
+    engines += [(f"{name}_async", engine.pool) for name, engine in _async_engines.items()]
+    for name, pool in engines:
+        if not isinstance(pool, QueuePool):
+            stats[name] = {"pool": type(pool).__name__}
+            continue
+        stats[name] = {
+            "pool_size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_in": pool.checkedin(),
+            "in_use": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "checkout_wait": metrics.timing(f"db.pool.{name}.checkout_wait"),
+            "checkout_timeouts": metrics.counter(f"db.pool.{name}.checkout_timeout"),
+        }
+    return stats
+
+
+def dispose_engines() -> None:
+    """Sync pool'ları kapat (fork sonrası / shutdown)"""
+    for engine in list(_engines.values()):
+        engine.dispose()
+
+
+async def dispose_async_engines() -> None:
+    for engine in list(_async_engines.values()):
+        await engine.dispose()
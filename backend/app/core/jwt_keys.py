@@ -0,0 +1,100 @@
+import glob
+import logging
+import os
+from typing import Dict, List, NamedTuple, Optional
+
+import jwt
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+HS256 = "HS256"
+
+
+class SigningKey(NamedTuple):
+    kid: str
+    algorithm: str
+    public_key: object
+    private_key: Optional[object]
+
+
+def _algorithm_for(key) -> str:
+    from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+
+    if isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)):
+        return "EdDSA"
+    if isinstance(key, (rsa.RSAPrivateKey, rsa.RSAPublicKey)):
+        return "RS256"
+    raise ValueError(f"Desteklenmeyen anahtar tipi: {type(key).__name__}")
+
+
+def _load_pem(path: str) -> SigningKey:
+    from cryptography.hazmat.primitives import serialization
+
+    with open(path, "rb") as f:
+        data = f.read()
+    # Dosya adı kid'dir: 2026-10-18.pem -> "2026-10-18"; emekliye ayrılan anahtarın yalnızca public'i kalabilir
+    kid = os.path.basename(path)[: -len(".pem")]
+    if b"PRIVATE KEY" in data:
+        private_key = serialization.load_pem_private_key(data, password=None)
+        return SigningKey(kid, _algorithm_for(private_key), private_key.public_key(), private_key)
+    public_key = serialization.load_pem_public_key(data)
+    return SigningKey(kid, _algorithm_for(public_key), public_key, None)
+
+
+class KeyRing:
+    """JWT imza anahtarları: aktif anahtar (kid) ile imzalanır, dizindeki tüm anahtarlarla doğrulanır.
+
+    Anahtar yoksa HS256 + SECRET_KEY ile imzalanır (eski davranış). Geçiş sürecinde
+    accept_hs256 açıkken HS256 token'lar kabul edilmeye devam eder.
+    """
+
+    def __init__(self, keys: List[SigningKey], active_kid: Optional[str], accept_hs256: bool):
+        self.keys: Dict[str, SigningKey] = {key.kid: key for key in keys}
+        signers = sorted(key.kid for key in keys if key.private_key is not None)
+        if active_kid and active_kid not in signers:
+            raise ValueError(f"JWT_ACTIVE_KID={active_kid} için private key bulunamadı")
+        # Varsayılan: adı en büyük (en yeni tarihli) private key
+        self.active: Optional[SigningKey] = self.keys[active_kid or signers[-1]] if signers else None
+        self.accept_hs256 = accept_hs256 or self.active is None
+        self._jwks = {"keys": [self._jwk(key) for key in keys]}
+
+    @classmethod
+    def from_directory(cls, directory: Optional[str], active_kid: Optional[str], accept_hs256: bool) -> "KeyRing":
+        paths = sorted(glob.glob(os.path.join(directory, "*.pem"))) if directory else []
+        keys = [_load_pem(path) for path in paths]
+        ring = cls(keys, active_kid, accept_hs256)
+        if ring.active:
+            logger.info(f"JWT imza anahtarı: {ring.active.kid} ({ring.active.algorithm}), toplam {len(keys)} anahtar")
+        return ring
+
+    @staticmethod
+    def _jwk(key: SigningKey) -> Dict:
+        algorithm = jwt.get_algorithm_by_name(key.algorithm)
+        return {**algorithm.to_jwk(key.public_key, as_dict=True), "kid": key.kid, "alg": key.algorithm, "use": "sig"}
+
+    def encode(self, payload: Dict) -> str:
+        if self.active is None:
+            return jwt.encode(payload, settings.SECRET_KEY, algorithm=HS256)
+        return jwt.encode(payload, self.active.private_key, algorithm=self.active.algorithm,
+                          headers={"kid": self.active.kid})
+
+    def decode(self, token: str) -> Dict:
+        """İmza + exp doğrulaması. Algoritma token başlığından değil, kid'in anahtar tipinden gelir."""
+        header = jwt.get_unverified_header(token)
+        kid = header.get("kid")
+        if kid is None:
+            if not self.accept_hs256:
+                raise jwt.InvalidTokenError("HS256 token'lar artık kabul edilmiyor")
+            return jwt.decode(token, settings.SECRET_KEY, algorithms=[HS256])
+        key = self.keys.get(kid)
+        if key is None:
+            raise jwt.InvalidTokenError(f"Bilinmeyen anahtar: {kid}")
+        return jwt.decode(token, key.public_key, algorithms=[key.algorithm])
+
+    def jwks(self) -> Dict:
+        return self._jwks
+
+
+keyring = KeyRing.from_directory(settings.JWT_KEYS_DIR, settings.JWT_ACTIVE_KID, settings.JWT_ACCEPT_HS256)
@@ -0,0 +1,62 @@
+import threading
+from typing import Dict
+
+
+class _Timing:
+    """Tek bir süre metriği için özet (adet, toplam, maksimum)"""
+
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 3),
+            "avg_ms": round(self.total * 1000 / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class MetricsRegistry:
+    """Süreç içi basit metrik kaydı (sayaçlar ve süre özetleri)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {}
+        self._timings: Dict[str, _Timing] = {}
+
+    def incr(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, seconds: float) -> None:
+        with self._lock:
+            timing = self._timings.get(name)
+            if timing is None:
+                timing = self._timings[name] = _Timing()
+            timing.count += 1
+            timing.total += seconds
+            if seconds > timing.max:
+                timing.max = seconds
+
+    def counter(self, name: str) -> int:
+        return self._counters.get(name, 0)
+
+    def timing(self, name: str) -> Dict:
+        timing = self._timings.get(name)
+        return timing.to_dict() if timing else _Timing().to_dict()
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "timings": {name: t.to_dict() for name, t in self._timings.items()},
+            }
+
+
+# Global instance
+metrics = MetricsRegistry()
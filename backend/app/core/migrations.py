@@ -0,0 +1,61 @@
+import logging
+import os
+from functools import lru_cache
+from typing import Optional, Set
+
+from sqlalchemy import text
+
+from .config import settings
+from .database import get_engine
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "alembic")
+
+
+class SchemaVersionError(RuntimeError):
+    """Veritabanı şeması kodun beklediği Alembic revizyonunda değil"""
+
+
+@lru_cache(maxsize=1)
+def expected_revisions() -> Set[str]:
+    """Kodla birlikte gelen Alembic head revizyon(lar)ı"""
+    from alembic.script import ScriptDirectory
+
+    return set(ScriptDirectory(ALEMBIC_DIR).get_heads())
+
+
+def current_revision() -> Optional[str]:
+    """Veritabanındaki alembic_version değeri (tek satırlık sorgu)"""
+    with get_engine().connect() as conn:
+        try:
+            return conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+        except Exception:
+            # alembic_version tablosu yok -> hiç migration çalışmamış
+            return None
+
+
+def verify_schema_version() -> None:
+    """Açılışta tek sorguluk şema kontrolü; uyumsuzlukta SCHEMA_CHECK=strict ise durur"""
+    mode = settings.SCHEMA_CHECK
+    if mode == "off":
+        return
+
+    expected = expected_revisions()
+    try:
+        current = current_revision()
+    except Exception as e:
+        current = None
+        message = f"Şema revizyonu okunamadı: {e}"
+    else:
+        if current in expected:
+            logger.info(f"Şema revizyonu güncel: {current}")
+            return
+        message = (
+            f"Veritabanı şema revizyonu {current!r}, beklenen {sorted(expected)}. "
+            f"Önce 'alembic upgrade head' çalıştırın."
+        )
+
+    if mode == "strict":
+        raise SchemaVersionError(message)
+    logger.warning(message)
@@ -0,0 +1,111 @@
+from enum import IntFlag
+from typing import Any, Dict, List
+
+from fastapi import Depends, HTTPException
+
+from .security import get_current_claims
+
+
+class Permission(IntFlag):
+    """Panel yetkileri; bir rolün yetkileri tek bir tamsayıda (bitset) tutulur"""
+
+    DASHBOARD_VIEW = 1 << 0
+    USERS_VIEW = 1 << 1
+    USERS_UPDATE = 1 << 2
+    DONATIONS_VIEW = 1 << 3
+    DONATIONS_UPDATE = 1 << 4
+    STREAMS_VIEW = 1 << 5
+    STREAMS_MANAGE = 1 << 6
+    REPORTS_VIEW = 1 << 7
+    SYSTEM_MANAGE = 1 << 8
+    # Admin paneline giriş; yalnızca owner/admin/super_admin
+    ADMIN_PANEL = 1 << 9
+
+
+ALL_PERMISSIONS = Permission(sum(Permission))
+
+# Rol tanımları: id -> (görünen ad, yetkiler). Sıra /roles yanıtındaki sıradır.
+ROLES = {
+    "owner": ("Sahip", ALL_PERMISSIONS),
+    "admin": ("Admin", ALL_PERMISSIONS),
+    "publisher": ("Yayıncı", Permission.DASHBOARD_VIEW | Permission.DONATIONS_VIEW
+                  | Permission.STREAMS_VIEW | Permission.STREAMS_MANAGE),
+    "viewer": ("İzleyici", Permission.DASHBOARD_VIEW),
+    "super_admin": ("Super Admin", ALL_PERMISSIONS),
+}
+
+# Panel sayfası -> aksiyon -> yetki (/roles/matrix)
+PAGES = {
+    "dashboard": {"view": Permission.DASHBOARD_VIEW},
+    "users": {"view": Permission.USERS_VIEW, "update": Permission.USERS_UPDATE},
+    "donations": {"view": Permission.DONATIONS_VIEW, "update": Permission.DONATIONS_UPDATE},
+    "streams": {"view": Permission.STREAMS_VIEW, "manage": Permission.STREAMS_MANAGE},
+    "reports": {"view": Permission.REPORTS_VIEW},
+    "system": {"manage": Permission.SYSTEM_MANAGE},
+}
+
+
+def _compile():
+    """Rol tablosunu bir kez derle: rol -> int ve sabit /roles, /roles/matrix yanıtları"""
+    role_bits = {role: int(permissions) for role, (_, permissions) in ROLES.items()}
+    roles_response = {
+        "roles": list(ROLES),
+        "definitions": [
+            {"id": role, "name": name, "bits": int(permissions), "permissions": permission_names(permissions)}
+            for role, (name, permissions) in ROLES.items()
+        ],
+    }
+    matrix_response = {
+        "matrix": [
+            {
+                "page": page,
+                "permissions": {
+                    action: [role for role, bits in role_bits.items() if bits & permission]
+                    for action, permission in actions.items()
+                },
+            }
+            for page, actions in PAGES.items()
+        ]
+    }
+    return role_bits, roles_response, matrix_response
+
+
+def permission_names(bits: int) -> List[str]:
+    return [permission.name.lower() for permission in Permission if bits & permission]
+
+
+ROLE_BITS, ROLES_RESPONSE, MATRIX_RESPONSE = _compile()
+
+
+def permissions_for(role: str, is_admin: bool = False, is_super_admin: bool = False) -> int:
+    """Kullanıcı satırından yetki bitset'i (token'a 'perms' claim'i olarak gömülür)"""
+    bits = ROLE_BITS.get(role or "", 0)
+    if bits & Permission.ADMIN_PANEL and not (is_admin or is_super_admin):
+        # Panel erişimi yalnızca is_admin/is_super_admin bayraklarıyla verilir, rol adıyla değil
+        bits = 0
+    if is_admin:
+        bits |= ROLE_BITS["admin"]
+    if is_super_admin:
+        bits |= ROLE_BITS["super_admin"]
+    return bits
+
+
+def claims_permissions(claims: Dict[str, Any]) -> int:
+    perms = claims.get("perms")
+    if perms is None:
+        # 'perms' claim'i olmayan eski token'lar: yine DB'ye gitmeden claim'lerden türet
+        return permissions_for(claims.get("role"), claims.get("is_admin", False), claims.get("is_super_admin", False))
+    return int(perms)
+
+
+def require_permission(required: Permission):
+    """Token'daki yetki bitset'inde required'ın tüm bitleri var mı (tek AND, DB yok)"""
+    required = int(required)
+
+    def dependency(claims: Dict[str, Any] = Depends(get_current_claims)) -> int:
+        perms = claims_permissions(claims)
+        if perms & required != required:
+            raise HTTPException(status_code=403, detail="Bu işlem için yetkiniz yok")
+        return perms
+
+    return dependency
@@ -0,0 +1,24 @@
+import re
+from typing import Iterable, List, Optional
+
+_NON_DIGIT = re.compile(r"\D+")
+
+
+def normalize_phone(raw) -> Optional[str]:
+    """Türkiye cep numarasını 5XXXXXXXXX biçimine getir; geçersizse None.
+
+    "+90 (532) 123 45 67", "0532-123-4567" ve "5321234567" aynı değere normalize edilir.
+    """
+    digits = _NON_DIGIT.sub("", str(raw)) if raw is not None else ""
+    if len(digits) == 12 and digits.startswith("90"):
+        digits = digits[2:]
+    elif len(digits) == 11 and digits.startswith("0"):
+        digits = digits[1:]
+    if len(digits) == 10 and digits[0] == "5":
+        return digits
+    return None
+
+
+def normalize_phones(values: Iterable) -> List[Optional[str]]:
+    """Bir kolonun tamamını tek geçişte normalize et (toplu import için)"""
+    return [normalize_phone(raw) for raw in values]
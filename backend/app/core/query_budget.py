@@ -0,0 +1,71 @@
+from contextvars import ContextVar
+from typing import NamedTuple, Optional
+
+from .config import settings
+
+
+class QueryBudget(NamedTuple):
+    name: str
+    statement_timeout_ms: int
+    lock_timeout_ms: int
+
+
+BUDGETS = {
+    "default": QueryBudget("default", settings.DB_STATEMENT_TIMEOUT_MS, settings.DB_LOCK_TIMEOUT_MS),
+    "mobile": QueryBudget("mobile", settings.DB_MOBILE_STATEMENT_TIMEOUT_MS, settings.DB_MOBILE_LOCK_TIMEOUT_MS),
+    "report": QueryBudget("report", settings.DB_REPORT_STATEMENT_TIMEOUT_MS, settings.DB_REPORT_LOCK_TIMEOUT_MS),
+}
+
+# Yol öneki -> bütçe sınıfı (ilk eşleşen kazanır)
+ROUTE_BUDGETS = [
+    ("/api/admin/v1/reports/", "report"),
+    ("/api/admin/v1/metrics/", "report"),
+    ("/api/admin/v1/stats", "report"),
+    ("/api/admin/v1/users/import", "report"),
+    ("/api/admin/", "default"),
+    ("/api/v1/", "mobile"),
+]
+
+# Bütçe aşımını bildiren PostgreSQL hata kodları
+QUERY_CANCELED = "57014"
+LOCK_NOT_AVAILABLE = "55P03"
+
+
+def budget_for_path(path: str) -> QueryBudget:
+    for prefix, name in ROUTE_BUDGETS:
+        if path.startswith(prefix):
+            return BUDGETS[name]
+    return BUDGETS["default"]
+
+
+class RequestBudgetState:
+    """İsteğin bütçesi ve (handler hatayı yutsa bile) aşım bilgisi"""
+
+    __slots__ = ("budget", "exceeded")
+
+    def __init__(self, budget: QueryBudget):
+        self.budget = budget
+        self.exceeded: Optional[str] = None
+
+
+_current: ContextVar[Optional[RequestBudgetState]] = ContextVar("request_query_budget", default=None)
+
+
+def start_request(path: str):
+    state = RequestBudgetState(budget_for_path(path))
+    return state, _current.set(state)
+
+
+def end_request(token) -> None:
+    _current.reset(token)
+
+
+def current_budget() -> QueryBudget:
+    state = _current.get()
+    return state.budget if state is not None else BUDGETS["default"]
+
+
+def mark_exceeded(pgcode: str) -> None:
+    state = _current.get()
+    if state is not None:
+        state.exceeded = "lock_timeout" if pgcode == LOCK_NOT_AVAILABLE else "statement_timeout"
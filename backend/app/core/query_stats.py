@@ -0,0 +1,79 @@
+import re
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class RequestQueryStats:
+    """Tek bir isteğin SQL özeti: sorgu sayısı, toplam süre, en yavaş ifade, tekrarlar"""
+
+    __slots__ = ("count", "total", "slowest", "slowest_statement", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.slowest = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.statements: Dict[str, int] = {}
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        normalized = _WHITESPACE.sub(" ", statement).strip()
+        self.statements[normalized] = self.statements.get(normalized, 0) + 1
+        if seconds > self.slowest:
+            self.slowest = seconds
+            self.slowest_statement = normalized
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Aynı ifadenin threshold ve üzeri tekrarı (olası N+1)"""
+        return sorted(
+            ((statement, count) for statement, count in self.statements.items() if count >= threshold),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+
+
+_current: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def start_request() -> Tuple[RequestQueryStats, object]:
+    stats = RequestQueryStats()
+    return stats, _current.set(stats)
+
+
+def end_request(token) -> None:
+    _current.reset(token)
+
+
+def current_stats() -> Optional[RequestQueryStats]:
+    return _current.get()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    starts = conn.info.get("query_start")
+    if stats is None or not starts:
+        return
+    stats.record(statement, time.perf_counter() - starts.pop())
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # Hata alan sorgu after_cursor_execute'a ulaşmaz; başlangıç zamanını temizle
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
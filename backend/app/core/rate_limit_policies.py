@@ -0,0 +1,86 @@
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
+from .config import settings
+
+WINDOWS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+class RateLimit(NamedTuple):
+    limit: int
+    window: int
+    # ip | user (doğrulanmış token claim'inden; yoksa ip) |
+    # phone (istek gövdesindeki telefon ya da e-posta; ikisi de yoksa bu limit atlanır)
+    key: str = "ip"
+
+
+class RateLimitPolicy(NamedTuple):
+    name: str
+    limits: Tuple[RateLimit, ...]
+    # Aynı bucket'ı paylaşan politikalar aynı kotadan düşer (limits aynı olmalı); cost istek başına düşülen miktar
+    bucket: Optional[str] = None
+    cost: int = 1
+    # Hybrid modda da her istekte Redis'e sorulur
+    strict: bool = False
+
+
+def parse_limit(value: str, key: str = "ip") -> RateLimit:
+    """'10/minute' -> RateLimit(10, 60)"""
+    count, _, unit = value.partition("/")
+    return RateLimit(int(count), WINDOWS.get(unit.strip(), 60), key)
+
+
+ADMIN_LIMITS = (RateLimit(600, 60, "user"),)
+
+# Heavy hitter olarak işaretlenen istemciye (ip/user/phone) eşleşen politikaya ek olarak uygulanır
+ESCALATED_POLICY = RateLimitPolicy("escalated", (RateLimit(30, 60), RateLimit(300, 3600)), strict=True)
+
+# (metot, yol kalıbı, politika); ilk eşleşen kazanır. {param} tek bir yol parçası, sondaki * önek eşleşmesi.
+POLICIES = [
+    ("POST", "/api/v1/auth/login",
+     RateLimitPolicy("login", (RateLimit(20, 60), RateLimit(10, 900, "phone")), strict=True)),
+    ("POST", "/api/admin/v1/auth/login",
+     RateLimitPolicy("admin_login", (RateLimit(10, 60), RateLimit(10, 900, "phone")), strict=True)),
+    ("POST", "/api/v1/auth/otp/send",
+     RateLimitPolicy("otp_send", (RateLimit(10, 3600), RateLimit(5, 3600, "phone")), strict=True)),
+    ("POST", "/api/v1/auth/otp/verify",
+     RateLimitPolicy("otp_verify", (RateLimit(30, 600), RateLimit(10, 600, "phone")), strict=True)),
+    ("POST", "/api/v1/auth/register", RateLimitPolicy("register", (RateLimit(10, 3600),), strict=True)),
+    ("POST", "/api/sms/v1/*",
+     RateLimitPolicy("sms", (RateLimit(10, 3600), RateLimit(5, 3600, "phone")), strict=True)),
+    ("GET", "/api/certificates/v1/verify/{code}", RateLimitPolicy("certificate_verify", (RateLimit(60, 60),))),
+    # Admin: kullanıcı başına ortak kota; ağır rapor/import istekleri bu kotadan daha fazla düşer
+    ("*", "/api/admin/v1/reports/*", RateLimitPolicy("admin_report", ADMIN_LIMITS, bucket="admin", cost=10)),
+    ("*", "/api/admin/v1/metrics/*", RateLimitPolicy("admin_report", ADMIN_LIMITS, bucket="admin", cost=10)),
+    ("POST", "/api/admin/v1/users/import", RateLimitPolicy("admin_import", ADMIN_LIMITS, bucket="admin", cost=60)),
+    ("*", "/api/admin/v1/*", RateLimitPolicy("admin", ADMIN_LIMITS)),
+    ("*", "/api/*", RateLimitPolicy("api", (RateLimit(settings.RATE_LIMIT_REQUESTS, settings.RATE_LIMIT_WINDOW),))),
+]
+
+
+def _pattern(method: str, path: str) -> str:
+    method_pattern = "[A-Z]+" if method == "*" else re.escape(method)
+    prefix = path.endswith("*")
+    parts = re.split(r"(\{[^}]+\})", path.rstrip("*"))
+    path_pattern = "".join("[^/]+" if part.startswith("{") else re.escape(part) for part in parts)
+    return f"{method_pattern} {path_pattern}{'.*' if prefix else ''}"
+
+
+class PolicyTable:
+    """Politika tablosu tek bir regex'e derlenir; istek başına tek fullmatch ile politika bulunur"""
+
+    def __init__(self, policies: List[Tuple[str, str, RateLimitPolicy]]):
+        self.policies = [policy for _, _, policy in policies]
+        # Alternasyon soldan sağa denenir: tablodaki sıra (ilk eşleşen kazanır) korunur
+        self._regex = re.compile("|".join(
+            f"(?P<p{index}>{_pattern(method, path)})" for index, (method, path, _) in enumerate(policies)
+        ))
+
+    def match(self, method: str, path: str) -> Optional[RateLimitPolicy]:
+        found = self._regex.fullmatch(f"{method} {path}")
+        if found is None:
+            return None
+        return self.policies[int(found.lastgroup[1:])]
+
+
+policy_table = PolicyTable(POLICIES)
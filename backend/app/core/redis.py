@@ -0,0 +1,34 @@
+import threading
+from typing import Optional
+
+import redis
+
+from .config import settings
+
+
+_client: Optional[redis.Redis] = None
+_lock = threading.Lock()
+
+
+def get_redis() -> redis.Redis:
+    """Süreç başına tek connection pool'lu Redis istemcisi (bağlantı ilk komutta açılır)"""
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                pool = redis.ConnectionPool.from_url(
+                    settings.REDIS_URL,
+                    max_connections=settings.REDIS_POOL_SIZE,
+                    socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+                    socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+                    decode_responses=True,
+                )
+                _client = redis.Redis(connection_pool=pool)
+    return _client
+
+
+def close_redis() -> None:
+    global _client
+    if _client is not None:
+        _client.connection_pool.disconnect()
+        _client = None
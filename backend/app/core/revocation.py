@@ -0,0 +1,130 @@
+import hashlib
+import logging
+import threading
+from typing import Dict, Iterable, List
+
+from .cache import register_channel
+from .config import settings
+from .metrics import metrics
+from .redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+REVOKED_PREFIX = "revoked:"
+# Kullanılmış (rotate edilmiş) refresh token jti'leri; yalnızca refresh sırasında Redis'te kontrol edilir
+USED_PREFIX = "revoked:used:"
+CHANNEL = "revocation"
+
+
+class BloomFilter:
+    """Sabit boyutlu Bloom filtresi (yanlış negatif yok, yanlış pozitif olasılığı doluluğa bağlı)"""
+
+    def __init__(self, size_bits: int, hashes: int):
+        self.size = size_bits
+        self.hashes = hashes
+        self._bits = bytearray((size_bits + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        # Double hashing: tek blake2b özetinden k konum
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class RevocationList:
+    """İptal edilmiş token aileleri/jti'ler: kaynak Redis (TTL = token ömrü), önünde yerel Bloom filtresi.
+
+    Bloom'da olmayan token kesin olarak iptal edilmemiştir; istek yolu Redis'e gitmez.
+    İptaller pub/sub ile tüm worker'ların filtresine eklenir.
+    """
+
+    def __init__(self, size_bits: int, hashes: int):
+        self._bloom = BloomFilter(size_bits, hashes)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _keys(claims: Dict) -> List[str]:
+        keys = []
+        if claims.get("fam"):
+            keys.append(f"fam:{claims['fam']}")
+        if claims.get("jti"):
+            keys.append(f"jti:{claims['jti']}")
+        return keys
+
+    def is_revoked(self, claims: Dict) -> bool:
+        candidates = [key for key in self._keys(claims) if key in self._bloom]
+        if not candidates:
+            return False
+        metrics.incr("revocation.bloom_positive")
+        try:
+            return get_redis().exists(*(f"{REVOKED_PREFIX}{key}" for key in candidates)) > 0
+        except Exception as e:
+            # Doğrulanamıyorsa güvenli taraf: iptal edilmiş say
+            logger.warning(f"İptal listesi okunamadı: {e}")
+            return True
+
+    def _add(self, key: str) -> None:
+        with self._lock:
+            self._bloom.add(key)
+
+    def revoke(self, kind: str, value: str, ttl: int) -> None:
+        """kind: 'fam' (tüm token ailesi) veya 'jti' (tek token); ttl saniye"""
+        key = f"{kind}:{value}"
+        self._add(key)
+        if ttl <= 0:
+            return
+        redis_client = get_redis()
+        redis_client.set(f"{REVOKED_PREFIX}{key}", "1", ex=int(ttl))
+        redis_client.publish(CHANNEL, key)
+        metrics.incr(f"revocation.revoke_{kind}")
+
+    def consume(self, jti: str, family: str, ttl: int) -> str:
+        """Refresh token'ı tek kullanımlık olarak işaretle: 'ok' | 'reused' | 'revoked'.
+
+        SET NX atomik olduğu için aynı token'la eşzamanlı iki refresh'ten yalnızca biri geçer.
+        """
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.exists(f"{REVOKED_PREFIX}fam:{family}")
+        pipe.set(f"{USED_PREFIX}{jti}", "1", nx=True, ex=max(int(ttl), 1))
+        family_revoked, first_use = pipe.execute()
+        if family_revoked:
+            return "revoked"
+        if not first_use:
+            metrics.incr("revocation.reuse_detected")
+            return "reused"
+        return "ok"
+
+    def _on_message(self, key: str) -> None:
+        self._add(key)
+
+    def rebuild(self) -> None:
+        """Filtreyi Redis'teki aktif iptallerden yeniden kur (açılışta ve pub/sub kopmalarında)"""
+        # Tarama sırasında gelen iptaller kaybolmasın diye kilit altında; yeni filtre
+        # tek seferde değiştirilir, okuyucular yarım filtre görmez
+        with self._lock:
+            keys = []
+            for pattern in (f"{REVOKED_PREFIX}fam:*", f"{REVOKED_PREFIX}jti:*"):
+                keys.extend(key[len(REVOKED_PREFIX):] for key in get_redis().scan_iter(match=pattern, count=1000))
+            bloom = BloomFilter(self._bloom.size, self._bloom.hashes)
+            for key in keys:
+                bloom.add(key)
+            self._bloom = bloom
+        logger.info(f"İptal filtresi yüklendi: {len(keys)} kayıt")
+
+    def start(self) -> None:
+        try:
+            self.rebuild()
+        except Exception as e:
+            logger.warning(f"İptal filtresi yüklenemedi: {e}")
+
+
+revocation_list = RevocationList(settings.REVOCATION_BLOOM_BITS, settings.REVOCATION_BLOOM_HASHES)
+register_channel(CHANNEL, revocation_list._on_message, resync=revocation_list.rebuild)
@@ -0,0 +1,126 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, FrozenSet, Iterable, Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql.elements import TextClause
+
+from .database import get_engine
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+COLUMNS_QUERY = text(
+    """
+    SELECT table_name, column_name
+    FROM information_schema.columns
+    WHERE table_schema = current_schema()
+    """
+)
+REVISION_QUERY = text("SELECT version_num FROM alembic_version")
+
+
+class SchemaCapabilities:
+    """Açılışta tek sorguyla okunan tablo/kolon haritası.
+
+    Endpoint'ler information_schema'ya istek başına gitmek yerine buradan okur;
+    harita yalnızca Alembic revizyonu değiştiğinde (veya elle) yenilenir.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._columns: Optional[Dict[str, FrozenSet[str]]] = None
+        self._compiled: Dict[str, TextClause] = {}
+        self.revision: Optional[str] = None
+        self.loaded_at: Optional[float] = None
+
+    def _read_revision(self, conn: Connection) -> Optional[str]:
+        try:
+            with conn.begin_nested():
+                return conn.execute(REVISION_QUERY).scalar()
+        except Exception:
+            return None
+
+    def _read_columns(self, conn: Connection) -> Dict[str, FrozenSet[str]]:
+        if conn.dialect.name == "postgresql":
+            tables: Dict[str, set] = {}
+            for table_name, column_name in conn.execute(COLUMNS_QUERY):
+                tables.setdefault(table_name, set()).add(column_name)
+            return {name: frozenset(columns) for name, columns in tables.items()}
+        # SQLite vb. (lokal/test): information_schema yok, inspector kullan
+        inspector = inspect(conn)
+        return {
+            name: frozenset(column["name"] for column in inspector.get_columns(name))
+            for name in inspector.get_table_names()
+        }
+
+    def load(self, conn: Optional[Connection] = None) -> None:
+        """Haritayı veritabanından yeniden oku ve derlenmiş sorguları temizle"""
+        if conn is None:
+            with get_engine().connect() as conn:
+                return self.load(conn)
+        start = time.perf_counter()
+        columns = self._read_columns(conn)
+        revision = self._read_revision(conn)
+        with self._lock:
+            self._columns = columns
+            self._compiled = {}
+            self.revision = revision
+            self.loaded_at = time.time()
+        metrics.incr("schema.reload")
+        logger.info(
+            f"Şema haritası yüklendi: {len(columns)} tablo, revizyon {revision} "
+            f"({(time.perf_counter() - start) * 1000:.1f}ms)"
+        )
+
+    def sync_revision(self, conn: Connection) -> Optional[str]:
+        """Revizyon değiştiyse (migration çalıştıysa) haritayı yenile"""
+        revision = self._read_revision(conn)
+        if self._columns is None or revision != self.revision:
+            self.load(conn)
+        return revision
+
+    def _tables(self) -> Dict[str, FrozenSet[str]]:
+        if self._columns is None:
+            self.load()
+        return self._columns
+
+    def has_table(self, table: str) -> bool:
+        return table in self._tables()
+
+    def has_column(self, table: str, column: str) -> bool:
+        return column in self._tables().get(table, ())
+
+    def column_or_null(self, alias: str, table: str, column: str) -> str:
+        """Kolon varsa `alias.column`, yoksa `NULL` (AS ile birlikte)"""
+        expression = f"{alias}.{column}" if self.has_column(table, column) else "NULL"
+        return f"{expression} AS {column}"
+
+    def coalesce_existing(self, alias: str, table: str, columns: Iterable[str]) -> str:
+        """Var olan kolonların COALESCE'i; hiçbiri yoksa NULL"""
+        existing = [f"{alias}.{column}" for column in columns if self.has_column(table, column)]
+        if not existing:
+            return "NULL"
+        return existing[0] if len(existing) == 1 else f"COALESCE({', '.join(existing)})"
+
+    def compiled(self, key: str, builder: Callable[["SchemaCapabilities"], str]) -> TextClause:
+        """Şemaya göre üretilen sorguyu harita yenilenene kadar önbellekte tut"""
+        self._tables()
+        query = self._compiled.get(key)
+        if query is None:
+            query = self._compiled[key] = text(builder(self))
+        return query
+
+    def snapshot(self) -> Dict:
+        tables = self._tables()
+        return {
+            "revision": self.revision,
+            "loaded_at": int(self.loaded_at) if self.loaded_at else None,
+            "tables": {name: sorted(columns) for name, columns in sorted(tables.items())},
+        }
+
+
+schema = SchemaCapabilities()
@@ -0,0 +1,134 @@
+import hashlib
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+import jwt
+from fastapi import Depends, Header, HTTPException
+
+from .cache import TTLCache
+from .config import settings
+from .jwt_keys import keyring
+from .revocation import revocation_list
+from ..services.session_service import session_service
+
+# Token digest'i -> doğrulanmış claim'ler. Mobil uygulama aynı token'ı oturum boyunca
+# yüzlerce kez gönderir; imza yalnızca ilk görüşte doğrulanır.
+_claims_cache = TTLCache("jwt_claims", settings.JWT_CLAIMS_CACHE_SIZE, settings.JWT_CLAIMS_CACHE_TTL)
+
+
+class RevokedTokenError(jwt.InvalidTokenError):
+    """Token geçerli imzalı fakat iptal edilmiş (logout, refresh tekrar kullanımı)"""
+
+
+def _digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+def encode_token(payload: Dict[str, Any], lifetime: timedelta) -> str:
+    """jti/iat/exp ekleyerek imzala"""
+    now = datetime.utcnow()
+    payload = {**payload, "jti": uuid.uuid4().hex, "iat": now, "exp": now + lifetime}
+    return keyring.encode(payload)
+
+
+def new_token_family() -> str:
+    """Login başına bir aile: rotation ile üretilen tüm token'lar aynı aileyi taşır"""
+    return uuid.uuid4().hex
+
+
+def create_refresh_token(user_id: str, family: Optional[str] = None, lifetime: Optional[timedelta] = None) -> str:
+    return encode_token(
+        {"user_id": str(user_id), "type": "refresh", "fam": family or new_token_family()},
+        lifetime or timedelta(days=settings.REFRESH_TOKEN_TTL_DAYS),
+    )
+
+
+def _remaining_seconds(claims: Dict[str, Any]) -> int:
+    return int(float(claims.get("exp", 0)) - time.time())
+
+
+def decode_token(token: str) -> Dict[str, Any]:
+    """Token'ı doğrula ve claim'leri döndür (önbellekli). jwt.InvalidTokenError fırlatır."""
+    key = _digest(token)
+    claims = _claims_cache.get(key)
+    if claims is None:
+        claims = keyring.decode(token)
+        ttl = settings.JWT_CLAIMS_CACHE_TTL
+        exp = claims.get("exp")
+        if exp is not None:
+            # Süresi dolan token önbellekten düşer; sonraki çağrı ExpiredSignatureError alır
+            ttl = min(ttl, float(exp) - time.time())
+        if ttl > 0:
+            _claims_cache.set(key, claims, ttl=ttl)
+
+    # Önbellekten gelse de iptal kontrolü yapılır (çoğu durumda yalnızca yerel Bloom filtresi)
+    if revocation_list.is_revoked(claims):
+        raise RevokedTokenError("Token iptal edilmiş")
+    return claims
+
+
+LEGACY_REFRESH_CLAIMS = {"user_id", "exp", "iat"}
+
+
+def rotate_refresh_token(token: str) -> Dict[str, Any]:
+    """Refresh token'ı tek kullanımlık olarak tüket ve claim'lerini döndür.
+
+    Çağıran aynı aileden (claims["fam"]) yeni bir refresh token üretmelidir. Kullanılmış
+    bir token tekrar gelirse çalınmış kabul edilir ve tüm aile iptal edilir.
+    """
+    claims = keyring.decode(token)
+    token_type = claims.get("type")
+    # type'sız eski access token'lar (role/is_admin taşır) refresh ailesi açamaz; eski refresh
+    # token'larda yalnızca user_id/exp/iat bulunur
+    if token_type != "refresh" and (token_type is not None or not set(claims) <= LEGACY_REFRESH_CLAIMS):
+        raise jwt.InvalidTokenError("Access token ile refresh yapılamaz")
+    # Rotation öncesi üretilmiş token'larda jti/fam yok: token özeti ile tek kullanımlık yapılır
+    jti = claims.get("jti") or hashlib.sha256(token.encode()).hexdigest()
+    family = claims.get("fam") or jti
+
+    status = revocation_list.consume(jti, family, _remaining_seconds(claims))
+    if status == "reused":
+        revocation_list.revoke("fam", family, settings.REFRESH_TOKEN_TTL_DAYS * 86400)
+    if status != "ok":
+        raise RevokedTokenError("Refresh token iptal edilmiş")
+    return {**claims, "fam": family}
+
+
+def revoke_token_family(claims: Dict[str, Any]) -> None:
+    """Logout: token'ın ailesini (tüm access/refresh token'ları) iptal et"""
+    if claims.get("fam"):
+        revocation_list.revoke("fam", claims["fam"], settings.REFRESH_TOKEN_TTL_DAYS * 86400)
+    elif claims.get("jti"):
+        revocation_list.revoke("jti", claims["jti"], _remaining_seconds(claims))
+
+
+def clear_token_cache() -> None:
+    _claims_cache.clear()
+
+
+def bearer_token(authorization: Optional[str]) -> str:
+    if not authorization or not authorization.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="Token gerekli")
+    return authorization.split(" ")[1]
+
+
+def get_current_claims(authorization: Optional[str] = Header(None)) -> Dict[str, Any]:
+    """Bearer token'ın doğrulanmış claim'leri"""
+    token = bearer_token(authorization)
+    try:
+        return decode_token(token)
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(status_code=401, detail="Token süresi dolmuş")
+    except jwt.InvalidTokenError:
+        raise HTTPException(status_code=401, detail="Geçersiz token")
+
+
+def get_current_user_id(claims: Dict[str, Any] = Depends(get_current_claims)) -> str:
+    """JWT token'dan kullanıcı id'si (user_id, yoksa sub)"""
+    user_id = claims.get("user_id") or claims.get("sub")
+    if not user_id:
+        raise HTTPException(status_code=401, detail="Geçersiz token")
+    session_service.touch(user_id)
+    return user_id
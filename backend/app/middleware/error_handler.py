@@ -213,9 +213,11 @@ async def http_exception_handler(request: Request, exc: HTTPException) -> JSONRe
     
     logger.warning(f"HTTP error {exc.status_code}: {exc.detail}")
     
+    # Retry-After gibi exception'a eklenen header'lar yanıta taşınır
     return JSONResponse(
         status_code=exc.status_code,
-        content=error_response.to_dict()
+        content=error_response.to_dict(),
+        headers=getattr(exc, "headers", None)
     )
 
 # Error codes mapping
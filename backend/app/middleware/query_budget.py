@@ -0,0 +1,37 @@
+import time
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from ..core.metrics import metrics
+from ..core.query_budget import end_request, start_request
+
+
+async def query_budget_middleware(request: Request, call_next):
+    """Yol için sorgu bütçesini seç; aşıldıysa (handler hatayı yutsa bile) temiz 503 döndür"""
+    state, token = start_request(request.url.path)
+    try:
+        response = await call_next(request)
+    finally:
+        end_request(token)
+
+    if state.exceeded is None:
+        return response
+
+    route = request.scope.get("route")
+    route_path = getattr(route, "path", request.url.path)
+    metrics.incr(f"db.budget_exceeded.{state.budget.name}.{state.exceeded}")
+    metrics.incr(f"db.budget_exceeded.route.{route_path}")
+    print(f"Query budget exceeded ({state.exceeded}, {state.budget.name}): {request.method} {route_path}")
+    return JSONResponse(
+        status_code=503,
+        content={
+            "success": False,
+            "error": "Query budget exceeded",
+            "error_code": "DB_QUERY_TIMEOUT",
+            "message": "İstek şu anda tamamlanamadı. Lütfen biraz sonra tekrar deneyin.",
+            "details": {"budget": state.budget.name, "reason": state.exceeded},
+            "timestamp": int(time.time()),
+        },
+        headers={"Retry-After": "1"},
+    )
@@ -0,0 +1,52 @@
+import json
+import logging
+
+from fastapi import Request
+
+from ..core.config import settings
+from ..core.metrics import metrics
+from ..core.query_stats import end_request, start_request
+
+logger = logging.getLogger(__name__)
+
+
+async def query_stats_middleware(request: Request, call_next):
+    """İstek başına SQL sayısı/süresi; DEBUG'da header ve yapılandırılmış log, N+1 uyarısı"""
+    stats, token = start_request()
+    try:
+        response = await call_next(request)
+    finally:
+        end_request(token)
+
+    route = request.scope.get("route")
+    route_path = getattr(route, "path", request.url.path)
+    repeated = stats.repeated(settings.QUERY_N_PLUS_ONE_THRESHOLD)
+
+    if stats.count:
+        metrics.observe(f"db.request.{route_path}", stats.total)
+    if repeated:
+        metrics.incr(f"db.n_plus_one.{route_path}")
+        logger.warning(
+            f"Olası N+1: {request.method} {route_path} aynı sorguyu {repeated[0][1]} kez çalıştırdı: "
+            f"{repeated[0][0][:200]}"
+        )
+
+    if settings.DEBUG:
+        response.headers["X-DB-Query-Count"] = str(stats.count)
+        response.headers["X-DB-Time-ms"] = f"{stats.total * 1000:.2f}"
+        response.headers["X-DB-Slowest-ms"] = f"{stats.slowest * 1000:.2f}"
+        if repeated:
+            response.headers["X-DB-N-Plus-One"] = str(len(repeated))
+        logger.info(json.dumps({
+            "event": "db_request_stats",
+            "request_id": getattr(request.state, "request_id", None),
+            "method": request.method,
+            "route": route_path,
+            "status": response.status_code,
+            "query_count": stats.count,
+            "db_time_ms": round(stats.total * 1000, 2),
+            "slowest_ms": round(stats.slowest * 1000, 2),
+            "slowest_statement": (stats.slowest_statement or "")[:500],
+            "repeated": [{"statement": statement[:200], "count": count} for statement, count in repeated],
+        }, ensure_ascii=False))
+    return response
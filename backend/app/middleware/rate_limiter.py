@@ -1,39 +1,370 @@
 from fastapi import Request, HTTPException
 from fastapi.responses import JSONResponse
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
+import math
+import threading
 import time
-import redis
-import os
-from typing import Dict, Optional
+from collections import OrderedDict
+from functools import wraps
+from typing import Dict, List, Optional, Tuple
+import hashlib
 import logging
 
+from ..core.config import settings
+from ..core.metrics import metrics
+from ..core.phone import normalize_phone
+from ..core.rate_limit_policies import ESCALATED_POLICY, RateLimitPolicy, parse_limit, policy_table
+from ..core.redis import get_redis
+from ..core.security import decode_token
+
 logger = logging.getLogger(__name__)
 
-# Redis connection (optional, falls back to in-memory)
-try:
-    redis_client = redis.Redis.from_url(
-        os.getenv("REDIS_URL", "redis://redis:6379"),
-        decode_responses=True,
-        socket_connect_timeout=5,
-        socket_timeout=5
-    )
-    redis_client.ping()  # Test connection
-    logger.info("Redis connected for rate limiting")
-except Exception as e:
-    logger.warning(f"Redis not available, using in-memory rate limiting: {e}")
-    redis_client = None
+# GCRA (generic cell rate algorithm): anahtar başına tek sayı, "teorik varış zamanı" (TAT, ms).
+# Saat Redis'in TIME'ından alınır; worker'lar arası saat farkı sonucu etkilemez.
+# KEYS: anahtar; ARGV: istek başına aralık (ms = window / limit), burst (ms = window), maliyet
+# Dönüş: {izin (1/0), kalan, tekrar deneme (ms), tamamen dolmasına kalan süre (ms)}
+GCRA_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then
+    tat = now
+end
+local new_tat = tat + interval * tonumber(ARGV[3])
+local allow_at = new_tat - burst
+-- Sınırda kayan nokta yuvarlaması (now + burst - burst > now) izinli isteği reddetmesin
+if allow_at - now > 0.01 then
+    return {0, 0, math.ceil(allow_at - now), math.ceil(tat - now)}
+end
+redis.call('SET', KEYS[1], new_tat, 'PX', math.ceil(new_tat - now))
+-- TAT ~1.8e12 ms; double/tostring yuvarlaması tam sayıya yakın 'kalan'ı bir aşağı çekmesin
+return {1, math.floor((burst - (new_tat - now)) / interval + 0.01), 0, math.ceil(new_tat - now)}
+"""
+
+# Hybrid mod mutabakatı: worker'ın yerelde izin verdiği istekleri (maliyet toplamı) koşulsuz
+# düşer ve güncel TAT'a kalan süreyi döndürür (maliyet 0: yalnızca okur). Borç en fazla bir pencere birikir.
+# KEYS: anahtar; ARGV: istek başına aralık (ms), burst (ms), tüketilen maliyet
+SYNC_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+local burst = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then
+    tat = now
+end
+local cost = tonumber(ARGV[3])
+if cost > 0 then
+    tat = math.min(tat + tonumber(ARGV[1]) * cost, now + 2 * burst)
+    redis.call('SET', KEYS[1], tat, 'PX', math.ceil(tat - now))
+end
+return math.ceil(tat - now)
+"""
+
+# phone anahtarlı limitler için JSON gövdesinde bakılan alanlar (ilk bulunan; telefon ya da e-posta)
+PHONE_FIELDS = ("phone", "to", "phoneOrEmail")
+
+# RFC 5321 sınırı; daha uzun değerler hesap anahtarı olarak kullanılmaz
+MAX_EMAIL_LENGTH = 254
+
+# Redis hatasından sonra bu kadar saniye doğrudan bellek içi limitere düşülür
+# (her istekte bağlantı zaman aşımını beklememek için)
+REDIS_RETRY_AFTER = 5.0
+
+# Büyük monotonic saatte (now + window) - window > now olabilir: sınır karşılaştırmalarının
+# ve kalan hak hesabının yuvarlama payı
+EPSILON = 1e-6
+
+
+class LocalGcra:
+    """Süreç içi GCRA: anahtar başına tek float (TAT), LRU sıralı ve anahtar sayısı sınırlı.
+
+    İstek başına O(1): bir sözlük okuması, move_to_end ve yazma. Sınır aşılınca en uzun
+    süredir görülmeyen anahtar atılır; atılan anahtarın TAT'ı zaten geçmişteyse (kota
+    dolmuşsa) bu hiçbir şeyi değiştirmez, değilse o istemci kotasını baştan alır.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._tats: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def check(self, key: str, limit: int, window: float, cost: int = 1) -> Tuple[bool, int, float, float]:
+        """(izin, kalan, tekrar deneme sn, tamamen dolmasına kalan sn)"""
+        now = time.monotonic()
+        interval = window / limit
+        with self._lock:
+            tats = self._tats
+            tat = tats.get(key, now)
+            if tat < now:
+                tat = now
+            new_tat = tat + interval * cost
+            allow_at = new_tat - window
+            if allow_at - now > EPSILON:
+                if key in tats:
+                    tats.move_to_end(key)
+                return False, 0, allow_at - now, tat - now
+            tats[key] = new_tat
+            tats.move_to_end(key)
+            if len(tats) > self.max_keys:
+                tats.popitem(last=False)
+        return True, int((window - (new_tat - now)) / interval + EPSILON), 0.0, new_tat - now
+
+    def __len__(self) -> int:
+        return len(self._tats)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tats.clear()
+
+
+class _Bucket:
+    __slots__ = ("tat", "pending", "touched", "interval", "window")
+
+    def __init__(self, tat: float, interval: float, window: float):
+        self.tat = tat
+        self.pending = 0
+        # Son mutabakattan beri istek geldi mi (diğer worker'ların tüketimini görmek için okunur)
+        self.touched = True
+        self.interval = interval
+        self.window = window
+
+
+class HybridRateLimiter:
+    """Worker başına yerel GCRA kovaları (token bucket eşdeğeri), Redis ile toplu mutabakat.
+
+    İstek yolu Redis'e gitmez: karar yerel kovadan verilir, tüketim 'pending'e yazılır.
+    Arka plan thread'i sync_interval'da bir (ya da bir anahtarda max_pending birikince hemen)
+    bekleyen tüketimleri tek pipeline ile Redis'e düşer ve dönen TAT ile yerel görüşü
+    günceller. Böylece bir anahtar için limit aşımı en fazla
+    worker sayısı x (max_pending + sync_interval içinde gelen istek) kadar olabilir.
+    """
+
+    def __init__(self, redis_client, sync_interval: float, max_pending: int, max_keys: int):
+        self.redis_client = redis_client
+        self.sync_interval = sync_interval
+        self.max_pending = max_pending
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, _Bucket]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._sync = None
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def check(self, key: str, limit: int, window: float, cost: int = 1) -> Tuple[bool, int, float, float]:
+        """(izin, kalan, tekrar deneme sn, tamamen dolmasına kalan sn); LocalGcra.check ile aynı"""
+        now = time.monotonic()
+        interval = window / limit
+        with self._lock:
+            buckets = self._buckets
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = _Bucket(now, interval, window)
+                if len(buckets) > self.max_keys:
+                    self._evict()
+            else:
+                buckets.move_to_end(key)
+            bucket.touched = True
+            tat = bucket.tat if bucket.tat > now else now
+            new_tat = tat + interval * cost
+            allow_at = new_tat - window
+            if allow_at - now > EPSILON:
+                return False, 0, allow_at - now, tat - now
+            bucket.tat = new_tat
+            bucket.pending += cost
+            if bucket.pending >= self.max_pending:
+                self._wakeup.set()
+        return True, int((window - (new_tat - now)) / interval + EPSILON), 0.0, new_tat - now
+
+    def _evict(self) -> None:
+        # Bekleyen tüketimi olan kovalar (mutabakat bekliyor) atlanır
+        for key, bucket in self._buckets.items():
+            if not bucket.pending:
+                del self._buckets[key]
+                return
+
+    def sync(self) -> int:
+        """Son mutabakattan beri kullanılan anahtarların tüketimini Redis'e düş, güncel TAT'ı al"""
+        with self._lock:
+            batch = []
+            for key, bucket in self._buckets.items():
+                if bucket.touched:
+                    bucket.touched = False
+                    batch.append((key, bucket, bucket.pending))
+        if not batch:
+            return 0
+        if self._sync is None:
+            self._sync = self.redis_client.register_script(SYNC_SCRIPT)
+        pipe = self.redis_client.pipeline(transaction=False)
+        for key, bucket, pending in batch:
+            self._sync(keys=[key], args=[bucket.interval * 1000, bucket.window * 1000, pending], client=pipe)
+        try:
+            results = pipe.execute()
+        except Exception:
+            # Redis'e ulaşılamıyor: yerel kovalar sınırlamaya devam eder, birikim sınırsız büyümesin
+            with self._lock:
+                for _, bucket, pending in batch:
+                    bucket.pending = max(0, bucket.pending - pending)
+            raise
+        now = time.monotonic()
+        with self._lock:
+            for (_, bucket, pending), remaining_ms in zip(batch, results):
+                # Mutabakat sürerken yerelde gelen istekler Redis'in görüşünün üstüne eklenir
+                bucket.pending -= pending
+                bucket.tat = now + int(remaining_ms) / 1000 + bucket.pending * bucket.interval
+        metrics.incr("rate_limit.synced_keys", len(batch))
+        return len(batch)
+
+    def _sync_loop(self) -> None:
+        while not self._stop.is_set():
+            self._wakeup.wait(self.sync_interval)
+            self._wakeup.clear()
+            try:
+                self.sync()
+            except Exception as e:
+                metrics.incr("rate_limit.sync_error")
+                logger.warning(f"Rate limit mutabakatı başarısız: {e}")
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sync_loop, name="rate-limit-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wakeup.set()
+        self._thread.join(timeout=self.sync_interval + 1)
+        self._thread = None
+        try:
+            self.sync()
+        except Exception as e:
+            logger.warning(f"Kapanışta rate limit mutabakatı başarısız: {e}")
+
+
+class CountMinSketch:
+    """4 x 65536 sayaç: her anahtar için tahmin >= gerçek, fazlası en fazla ~e/65536 x toplam.
+
+    Dört satır indeksi anahtarın 64 bit hash'inin 16 bitlik parçalarından gelir (tek hash).
+    Conservative update: yalnızca tahminin altında kalan sayaçlar yükseltilir; çarpışan
+    hafif anahtarların tahmini ağır anahtarlar yüzünden daha az şişer.
+    """
+
+    WIDTH = 1 << 16
+
+    def __init__(self):
+        self._table = [0] * (4 * self.WIDTH)
+
+    def add(self, key: str, count: int = 1) -> int:
+        """Sayacı artır ve güncel tahmini döndür"""
+        digest = hash(key)
+        s0 = digest & 0xFFFF
+        s1 = 0x10000 | (digest >> 16 & 0xFFFF)
+        s2 = 0x20000 | (digest >> 32 & 0xFFFF)
+        s3 = 0x30000 | (digest >> 48 & 0xFFFF)
+        table = self._table
+        estimate = min(table[s0], table[s1], table[s2], table[s3]) + count
+        if table[s0] < estimate:
+            table[s0] = estimate
+        if table[s1] < estimate:
+            table[s1] = estimate
+        if table[s2] < estimate:
+            table[s2] = estimate
+        if table[s3] < estimate:
+            table[s3] = estimate
+        return estimate
+
+
+class HeavyHitters:
+    """Pencere başına en çok istek yapan anahtarlar (count-min sketch + top-K), worker başına.
+
+    Bellek anahtar sayısından bağımsızdır: sketch (~2 MiB) ve top_k girdi.
+    Penceredeki tahmini escalate_threshold'u geçen anahtar escalate_seconds boyunca
+    ESCALATED_POLICY'nin daha sıkı limitlerine de tabi olur.
+    """
+
+    def __init__(self, window: float, top_k: int, escalate_threshold: int, escalate_seconds: float):
+        self.window = window
+        self.top_k = top_k
+        self.escalate_threshold = escalate_threshold
+        self.escalate_seconds = escalate_seconds
+        self._lock = threading.Lock()
+        self._escalated: Dict[str, float] = {}
+        self._previous: List[Tuple[str, int]] = []
+        self._reset(time.time())
+
+    def _reset(self, now: float) -> None:
+        self._sketch = CountMinSketch()
+        self._top: Dict[str, int] = {}
+        self._top_min = 0
+        self._window_start = now
+
+    def _rotate(self, now: float) -> None:
+        self._previous = self._ranked()
+        self._escalated = {key: until for key, until in self._escalated.items() if until > now}
+        self._reset(now - (now - self._window_start) % self.window)
+
+    def _ranked(self) -> List[Tuple[str, int]]:
+        return sorted(self._top.items(), key=lambda item: item[1], reverse=True)
+
+    def add(self, key: str, count: int = 1) -> bool:
+        """İsteği say; anahtar şu an escalate edilmiş mi"""
+        now = time.time()
+        with self._lock:
+            if now - self._window_start >= self.window:
+                self._rotate(now)
+            estimate = self._sketch.add(key, count)
+            top = self._top
+            if key in top or len(top) < self.top_k:
+                top[key] = estimate
+            elif estimate > self._top_min:
+                del top[min(top, key=top.get)]
+                top[key] = estimate
+                self._top_min = min(top.values())
+            if self.escalate_threshold and estimate >= self.escalate_threshold and key not in self._escalated:
+                self._escalated[key] = now + self.escalate_seconds
+                metrics.incr("rate_limit.escalated")
+                logger.warning(f"Rate limit: {key} pencerede ~{estimate} istekle sıkı limite alındı")
+            until = self._escalated.get(key)
+        return until is not None and until > now
+
+    def release(self, key: str) -> bool:
+        with self._lock:
+            return self._escalated.pop(key, None) is not None
+
+    def snapshot(self) -> Dict:
+        now = time.time()
+        with self._lock:
+            if now - self._window_start >= self.window:
+                self._rotate(now)
+            return {
+                "window": self.window,
+                "window_start": int(self._window_start),
+                "current": [{"key": key, "estimate": count} for key, count in self._ranked()],
+                "previous": [{"key": key, "estimate": count} for key, count in self._previous],
+                "escalated": [
+                    {"key": key, "until": int(until)} for key, until in self._escalated.items() if until > now
+                ],
+                "escalate_threshold": self.escalate_threshold,
+            }
 
-# In-memory storage for rate limiting (fallback)
-memory_storage: Dict[str, Dict] = {}
 
 class CustomRateLimiter:
     """Özel rate limiter sınıfı"""
     
-    def __init__(self, redis_client=None):
+    def __init__(self, redis_client=None, max_memory_keys: int = settings.RATE_LIMIT_MEMORY_MAX_KEYS,
+                 hybrid: Optional[HybridRateLimiter] = None, heavy_hitters: Optional[HeavyHitters] = None):
         self.redis_client = redis_client
-        self.memory_storage = memory_storage
+        self.memory = LocalGcra(max_memory_keys)
+        # Verilirse strict olmayan kontroller yerel kovalardan yapılır (Redis'e toplu mutabakat)
+        self.hybrid = hybrid
+        self.heavy_hitters = heavy_hitters
+        self._gcra = None
+        self._redis_down_until = 0.0
     
     def get_client_ip(self, request: Request) -> str:
         """Client IP adresini al"""
@@ -48,177 +379,179 @@ class CustomRateLimiter:
             return real_ip
         
         # Default client IP
-        return get_remote_address(request)
+        return request.client.host if request.client else "127.0.0.1"
     
     def get_user_id(self, request: Request) -> Optional[str]:
-        """Request'ten user ID al (JWT token'dan)"""
+        """Request'ten user ID al (imzası doğrulanmış token claim'lerinden, önbellekli)"""
+        authorization = request.headers.get("Authorization")
+        if not authorization or not authorization.startswith("Bearer "):
+            return None
+        try:
+            claims = decode_token(authorization.split(" ", 1)[1])
+        except Exception:
+            return None
+        return claims.get("user_id") or claims.get("sub")
+    
+    async def get_account(self, request: Request) -> Optional[str]:
+        """JSON gövdesindeki hesap (phone / to / phoneOrEmail): normalize telefon ya da küçük harfli e-posta"""
         try:
-            authorization = request.headers.get("Authorization")
-            if authorization and authorization.startswith("Bearer "):
-                token = authorization.split(" ")[1]
-                # JWT token'ı decode et (basit implementation)
-                import jwt
-                payload = jwt.decode(token, options={"verify_signature": False})
-                return payload.get("user_id")
+            body = await request.json()
         except Exception:
-            pass
+            return None
+        if not isinstance(body, dict):
+            return None
+        for field in PHONE_FIELDS:
+            value = body.get(field)
+            if isinstance(value, str):
+                phone = normalize_phone(value)
+                if phone:
+                    return f"phone:{phone}"
+                if "@" in value and len(value) <= MAX_EMAIL_LENGTH:
+                    # Gövdedeki serbest metin anahtara doğrudan girmez: sabit boylu özet
+                    digest = hashlib.blake2b(value.strip().lower().encode(), digest_size=16).hexdigest()
+                    return f"email:{digest}"
+                return None
         return None
     
-    def get_key(self, request: Request, identifier: str = "ip") -> str:
-        """Rate limit key oluştur"""
+    def get_key(self, request: Request, identifier: str = "ip", account: Optional[str] = None) -> Optional[str]:
+        """Rate limit key oluştur (user bulunamazsa IP; hesap bulunamazsa None: limit uygulanmaz)"""
         if identifier == "user":
             user_id = self.get_user_id(request)
             if user_id:
-                return f"rate_limit:user:{user_id}"
+                return f"user:{user_id}"
+        elif identifier == "phone":
+            # IP'ye düşülmez: aynı NAT/ofis arkasındaki farklı hesaplar birbirini kilitlemesin
+            return account
         
         # Default: IP-based
         client_ip = self.get_client_ip(request)
-        return f"rate_limit:ip:{client_ip}"
+        return f"ip:{client_ip}"
+    
+    async def check_policy(self, request: Request, policy: RateLimitPolicy) -> tuple[bool, Dict]:
+        """Politikanın tüm limitlerini uygula; izin verilirse en az kalan hakkın bilgisi döner"""
+        account = None
+        if any(rate.key == "phone" for rate in policy.limits):
+            account = await self.get_account(request)
+        checks = [(policy, rate, self.get_key(request, rate.key, account)) for rate in policy.limits]
+        checks = [check for check in checks if check[2] is not None]
+        if self.heavy_hitters is not None:
+            for identity in {identity for _, _, identity in checks}:
+                if self.heavy_hitters.add(identity, policy.cost):
+                    checks.extend((ESCALATED_POLICY, rate, identity) for rate in ESCALATED_POLICY.limits)
+        tightest = None
+        for checked, rate, identity in checks:
+            key = f"rate_limit:{checked.bucket or checked.name}:{identity}:{rate.window}"
+            allowed, info = self.is_allowed(key, rate.limit, rate.window, checked.cost, checked.strict)
+            if not allowed:
+                return False, info
+            if tightest is None or info["remaining"] < tightest["remaining"]:
+                tightest = info
+        return True, tightest
     
-    def is_allowed(self, key: str, limit: int, window: int) -> tuple[bool, Dict]:
-        """Rate limit kontrolü yap"""
+    def is_allowed(self, key: str, limit: int, window: int, cost: int = 1, strict: bool = False) -> tuple[bool, Dict]:
+        """Rate limit kontrolü yap (strict: hybrid modda da her istekte Redis)"""
         current_time = int(time.time())
-        window_start = current_time - window
         
-        if self.redis_client:
-            return self._redis_check(key, limit, window, current_time, window_start)
+        if self.hybrid is not None and not strict:
+            allowed, info = self._local_check(self.hybrid, key, limit, window, cost, current_time)
+        elif self.redis_client and time.monotonic() >= self._redis_down_until:
+            allowed, info = self._redis_check(key, limit, window, cost, current_time)
         else:
-            return self._memory_check(key, limit, window, current_time, window_start)
+            allowed, info = self._local_check(self.memory, key, limit, window, cost, current_time)
+        if not allowed:
+            metrics.incr("rate_limit.rejected")
+        return allowed, info
     
-    def _redis_check(self, key: str, limit: int, window: int, current_time: int, window_start: int) -> tuple[bool, Dict]:
-        """Redis ile rate limit kontrolü"""
+    def _redis_check(self, key: str, limit: int, window: int, cost: int, current_time: int) -> tuple[bool, Dict]:
+        """Redis ile rate limit kontrolü (tek EVALSHA, atomik GCRA)"""
         try:
-            pipe = self.redis_client.pipeline()
-            
-            # Eski kayıtları temizle
-            pipe.zremrangebyscore(key, 0, window_start)
-            
-            # Mevcut istekleri say
-            pipe.zcard(key)
-            
-            # Yeni isteği ekle
-            pipe.zadd(key, {str(current_time): current_time})
-            
-            # TTL ayarla
-            pipe.expire(key, window)
-            
-            results = pipe.execute()
-            current_count = results[1]
-            
-            if current_count >= limit:
-                # Rate limit aşıldı
-                remaining = 0
-                reset_time = current_time + window
-            else:
-                remaining = limit - current_count - 1
-                reset_time = current_time + window
-            
-            return False, {
+            if self._gcra is None:
+                self._gcra = self.redis_client.register_script(GCRA_SCRIPT)
+            interval_ms = window * 1000 / limit
+            allowed, remaining, retry_after_ms, reset_after_ms = self._gcra(
+                keys=[key], args=[interval_ms, window * 1000, cost]
+            )
+            return bool(allowed), {
                 "limit": limit,
-                "remaining": remaining,
-                "reset_time": reset_time,
-                "window": window
+                "remaining": int(remaining),
+                "reset_time": current_time + math.ceil(int(reset_after_ms) / 1000),
+                "window": window,
+                "retry_after": math.ceil(int(retry_after_ms) / 1000),
             }
             
         except Exception as e:
             logger.error(f"Redis rate limit error: {e}")
-            # Redis hatası durumunda memory'ye fallback
-            return self._memory_check(key, limit, window, current_time, window_start)
+            # Redis hatası durumunda bir süre memory'ye fallback
+            self._redis_down_until = time.monotonic() + REDIS_RETRY_AFTER
+            return self._local_check(self.memory, key, limit, window, cost, current_time)
     
-    def _memory_check(self, key: str, limit: int, window: int, current_time: int, window_start: int) -> tuple[bool, Dict]:
-        """Memory ile rate limit kontrolü"""
-        if key not in self.memory_storage:
-            self.memory_storage[key] = {
-                "requests": [],
-                "last_cleanup": current_time
-            }
-        
-        storage = self.memory_storage[key]
-        
-        # Eski kayıtları temizle
-        storage["requests"] = [req_time for req_time in storage["requests"] if req_time > window_start]
-        
-        # Mevcut istekleri say
-        current_count = len(storage["requests"])
-        
-        if current_count >= limit:
-            # Rate limit aşıldı
-            remaining = 0
-            reset_time = current_time + window
-            allowed = False
-        else:
-            # İsteği ekle
-            storage["requests"].append(current_time)
-            remaining = limit - current_count - 1
-            reset_time = current_time + window
-            allowed = True
-        
+    @staticmethod
+    def _local_check(local, key: str, limit: int, window: int, cost: int, current_time: int) -> tuple[bool, Dict]:
+        """Süreç içi GCRA ile rate limit kontrolü (LocalGcra ya da hybrid kovalar)"""
+        allowed, remaining, retry_after, reset_after = local.check(key, limit, window, cost)
         return allowed, {
             "limit": limit,
             "remaining": remaining,
-            "reset_time": reset_time,
-            "window": window
+            "reset_time": current_time + math.ceil(reset_after),
+            "window": window,
+            "retry_after": math.ceil(retry_after),
         }
 
-# Global rate limiter instance
-rate_limiter = CustomRateLimiter(redis_client)
-
-# SlowAPI limiter (fallback)
-limiter = Limiter(
-    key_func=get_remote_address,
-    storage_uri=os.getenv("REDIS_URL", "memory://"),
-    default_limits=["1000/hour"]
+# Global rate limiter instance (Redis bağlantısı ilk istekte açılır; readiness ile aynı pool)
+# hybrid: /api/ trafiği yerel kovalardan; strict politikalar (login, OTP, SMS) her istekte Redis'e gider
+rate_limiter = CustomRateLimiter(
+    get_redis(),
+    hybrid=HybridRateLimiter(
+        get_redis(),
+        sync_interval=settings.RATE_LIMIT_SYNC_INTERVAL_MS / 1000,
+        max_pending=settings.RATE_LIMIT_SYNC_MAX_PENDING,
+        max_keys=settings.RATE_LIMIT_MEMORY_MAX_KEYS,
+    ) if settings.RATE_LIMIT_MODE == "hybrid" else None,
+    heavy_hitters=HeavyHitters(
+        window=settings.RATE_LIMIT_HEAVY_HITTERS_WINDOW,
+        top_k=settings.RATE_LIMIT_HEAVY_HITTERS_TOP_K,
+        escalate_threshold=settings.RATE_LIMIT_ESCALATE_THRESHOLD,
+        escalate_seconds=settings.RATE_LIMIT_ESCALATE_SECONDS,
+    ),
 )
 
+
+def rate_limited_response(info: Dict, message: str) -> JSONResponse:
+    error_response = {
+        "success": False,
+        "error": "Rate limit exceeded",
+        "error_code": "RATE_LIMIT_EXCEEDED",
+        "message": message,
+        "details": {
+            "limit": info["limit"],
+            "remaining": info["remaining"],
+            "reset_time": info["reset_time"],
+            "window": info["window"]
+        },
+        "timestamp": int(time.time())
+    }
+    return JSONResponse(
+        status_code=429,
+        content=error_response,
+        headers={
+            "X-RateLimit-Limit": str(info["limit"]),
+            "X-RateLimit-Remaining": str(info["remaining"]),
+            "X-RateLimit-Reset": str(info["reset_time"]),
+            "Retry-After": str(info["retry_after"])
+        }
+    )
+
+
 def rate_limit_decorator(limit: str, identifier: str = "ip"):
-    """Rate limit decorator"""
+    """Rate limit decorator (limit: "10/minute" gibi; tanımda bir kez parse edilir)"""
     def decorator(func):
+        policy = RateLimitPolicy(f"endpoint:{func.__module__}.{func.__name__}", (parse_limit(limit, identifier),))
+        
+        @wraps(func)
         async def wrapper(request: Request, *args, **kwargs):
-            key = rate_limiter.get_key(request, identifier)
-            
-            # Limit formatını parse et (örn: "10/minute", "100/hour")
-            limit_parts = limit.split("/")
-            limit_count = int(limit_parts[0])
-            limit_window = limit_parts[1]
-            
-            # Window'u saniyeye çevir
-            window_map = {
-                "second": 1,
-                "minute": 60,
-                "hour": 3600,
-                "day": 86400
-            }
-            window_seconds = window_map.get(limit_window, 60)
-            
-            # Rate limit kontrolü
-            allowed, info = rate_limiter.is_allowed(key, limit_count, window_seconds)
-            
+            allowed, info = await rate_limiter.check_policy(request, policy)
             if not allowed:
-                error_response = {
-                    "success": False,
-                    "error": "Rate limit exceeded",
-                    "error_code": "RATE_LIMIT_EXCEEDED",
-                    "message": f"Çok fazla istek gönderildi. Limit: {limit}",
-                    "details": {
-                        "limit": info["limit"],
-                        "remaining": info["remaining"],
-                        "reset_time": info["reset_time"],
-                        "window": info["window"]
-                    },
-                    "timestamp": int(time.time())
-                }
-                
-                response = JSONResponse(
-                    status_code=429,
-                    content=error_response,
-                    headers={
-                        "X-RateLimit-Limit": str(info["limit"]),
-                        "X-RateLimit-Remaining": str(info["remaining"]),
-                        "X-RateLimit-Reset": str(info["reset_time"]),
-                        "Retry-After": str(info["window"])
-                    }
-                )
-                return response
+                return rate_limited_response(info, f"Çok fazla istek gönderildi. Limit: {limit}")
             
             # Rate limit headers ekle
             request.state.rate_limit_info = info
@@ -229,7 +562,7 @@ def rate_limit_decorator(limit: str, identifier: str = "ip"):
     return decorator
 
 # Rate limit exceeded handler
-def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
+def rate_limit_exceeded_handler(request: Request, exc: HTTPException):
     """Rate limit aşıldığında çağrılan handler"""
     response = JSONResponse(
         status_code=429,
@@ -252,41 +585,17 @@ def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
 
 # Rate limit middleware
 async def rate_limit_middleware(request: Request, call_next):
-    """Rate limit middleware"""
-    # Özel endpoint'ler için rate limit uygula
-    if request.url.path.startswith("/api/"):
-        # API endpoint'leri için genel rate limit
-        key = rate_limiter.get_key(request, "ip")
-        allowed, info = rate_limiter.is_allowed(key, 1000, 3600)  # 1000/hour
-        
+    """Rate limit middleware (politika tablosundan: app.core.rate_limit_policies)"""
+    policy = policy_table.match(request.method, request.url.path)
+    if policy is not None:
+        allowed, info = await rate_limiter.check_policy(request, policy)
         if not allowed:
-            error_response = {
-                "success": False,
-                "error": "Rate limit exceeded",
-                "error_code": "RATE_LIMIT_EXCEEDED",
-                "message": "API rate limit aşıldı. Lütfen daha sonra tekrar deneyin.",
-                "details": {
-                    "limit": info["limit"],
-                    "remaining": info["remaining"],
-                    "reset_time": info["reset_time"],
-                    "window": info["window"]
-                },
-                "timestamp": int(time.time())
-            }
-            
-            return JSONResponse(
-                status_code=429,
-                content=error_response,
-                headers={
-                    "X-RateLimit-Limit": str(info["limit"]),
-                    "X-RateLimit-Remaining": str(info["remaining"]),
-                    "X-RateLimit-Reset": str(info["reset_time"]),
-                    "Retry-After": str(info["window"])
-                }
-            )
+            metrics.incr(f"rate_limit.rejected.{policy.name}")
+            return rate_limited_response(info, "API rate limit aşıldı. Lütfen daha sonra tekrar deneyin.")
         
-        # Rate limit bilgilerini request state'e ekle
-        request.state.rate_limit_info = info
+        # Rate limit bilgilerini request state'e ekle (uygulanan limit yoksa info None)
+        if info is not None:
+            request.state.rate_limit_info = info
     
     response = await call_next(request)
     
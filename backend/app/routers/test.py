@@ -25,9 +25,8 @@ async def login_as_admin():
     # Test amaçlı: üretimde kapatılmalı. ENV != test olsa da local geliştirme için token üret.
     try:
         # Basit: kullanıcı tablosundan admin var mı, yoksa oluştur ve token döndür
-        import jwt
-        from datetime import datetime, timedelta
-        SECRET_KEY = os.getenv("SECRET_KEY", "test_secret")
+        from datetime import timedelta
+        from ..core.security import encode_token
         DATABASE_URL = os.getenv("DATABASE_URL")
         if not DATABASE_URL:
             return {"access_token": "test", "token_type": "bearer"}
@@ -39,10 +38,9 @@ async def login_as_admin():
             "user_id": str(user_id),
             "is_admin": True,
             "is_super_admin": True,
-            "exp": datetime.utcnow() + timedelta(hours=1),
-            "iat": datetime.utcnow(),
+            "type": "access",
         }
-        token = jwt.encode(payload, SECRET_KEY, algorithm="HS256")
+        token = encode_token(payload, timedelta(hours=1))
         return {"access_token": token, "token_type": "bearer"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
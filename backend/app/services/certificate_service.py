@@ -23,8 +23,15 @@ class Certificate(BaseModel):
 
 class CertificateService:
     def __init__(self):
-        self.certificates: Dict[str, Certificate] = {}
-        self._initialize_mock_data()
+        self._certificates: Optional[Dict[str, Certificate]] = None
+
+    @property
+    def certificates(self) -> Dict[str, Certificate]:
+        # Mock veriler import anında değil, ilk kullanımda yüklenir
+        if self._certificates is None:
+            self._certificates = {}
+            self._initialize_mock_data()
+        return self._certificates
     
     def _initialize_mock_data(self):
         """Mock sertifika verilerini başlat"""
@@ -1,9 +1,20 @@
-import os
-import requests
+import asyncio
+import gzip
+import json
 import time
 from typing import List, Dict, Optional
+
+import httpx
 from pydantic import BaseModel
-import json
+
+from ..core.config import settings
+
+EXPO_PUSH_URL = "https://exp.host/--/api/v2/push/send"
+# Expo istek başına en fazla 100 mesaj kabul eder
+EXPO_CHUNK_SIZE = 100
+# Bundan büyük gövdeler gzip'lenir
+GZIP_MIN_BYTES = 1024
+RETRY_STATUSES = (429, 500, 502, 503, 504)
 
 class ExpoPushMessage(BaseModel):
     to: str  # Expo push token
@@ -14,35 +25,140 @@ class ExpoPushMessage(BaseModel):
     badge: Optional[int] = None
     channelId: str = "default"
 
+class ExpoPushClient:
+    """Expo Push API async istemcisi: mesajlar 100'lük parçalara bölünür, parçalar sınırlı
+    eşzamanlılıkla keep-alive bağlantı havuzu üzerinden gönderilir; mesaj başına ticket döner"""
+
+    def __init__(self,
+                 url: str = EXPO_PUSH_URL,
+                 concurrency: int = 6,
+                 timeout: float = 10.0,
+                 max_attempts: int = 3,
+                 access_token: Optional[str] = None,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.url = url
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.access_token = access_token
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        # Tüm send() çağrıları aynı bütçeyi paylaşır (havuzdaki bağlantı sayısı kadar)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # AsyncClient event loop'a bağlıdır; loop değişirse (testler, script'ler) yenisi açılır
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            headers = {"Accept": "application/json", "Accept-Encoding": "gzip, deflate"}
+            if self.access_token:
+                headers["Authorization"] = f"Bearer {self.access_token}"
+            self._client = httpx.AsyncClient(
+                headers=headers,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+                transport=self.transport,
+            )
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            if self._loop is asyncio.get_running_loop():
+                await self._client.aclose()
+            self._client = None
+            self._semaphore = None
+            self._loop = None
+
+    @staticmethod
+    def expand(messages: List[Dict]) -> List[Dict]:
+        """'to' listesi olan mesajları token başına tek mesaja açar (ticket'lar token'larla hizalanır)"""
+        expanded = []
+        for message in messages:
+            to = message.get("to")
+            if isinstance(to, (list, tuple)):
+                expanded.extend({**message, "to": token} for token in to)
+            else:
+                expanded.append(message)
+        return expanded
+
+    async def send(self, messages: List[Dict]) -> List[Dict]:
+        """Mesajları gönderir; girişteki (açılmış) sırayla {"to", "status", "id" | "message", "details"} listesi döner"""
+        messages = self.expand(messages)
+        if not messages:
+            return []
+        client = self._get_client()
+        semaphore = self._semaphore
+        chunks = [messages[i:i + EXPO_CHUNK_SIZE] for i in range(0, len(messages), EXPO_CHUNK_SIZE)]
+
+        async def send_chunk(chunk: List[Dict]) -> List[Dict]:
+            async with semaphore:
+                tickets = await self._post(client, chunk)
+            return [{"to": message["to"], **ticket} for message, ticket in zip(chunk, tickets)]
+
+        results = await asyncio.gather(*(send_chunk(chunk) for chunk in chunks))
+        return [ticket for chunk in results for ticket in chunk]
+
+    async def _post(self, client: httpx.AsyncClient, chunk: List[Dict]) -> List[Dict]:
+        body = json.dumps(chunk, ensure_ascii=False).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if len(body) > GZIP_MIN_BYTES:
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+
+        error = None
+        for attempt in range(self.max_attempts):
+            if attempt:
+                await asyncio.sleep(0.5 * 2 ** (attempt - 1))
+            try:
+                response = await client.post(self.url, content=body, headers=headers)
+            except httpx.TransportError as e:
+                error = str(e)
+                continue
+            if response.status_code in RETRY_STATUSES:
+                error = f"HTTP {response.status_code}: {response.text[:200]}"
+                continue
+            if response.status_code != 200:
+                error = f"HTTP {response.status_code}: {response.text[:200]}"
+                break
+            tickets = response.json().get("data")
+            if isinstance(tickets, list) and len(tickets) == len(chunk):
+                return tickets
+            error = f"Beklenmeyen Expo yanıtı: {response.text[:200]}"
+            break
+
+        print(f"Expo push parçası gönderilemedi ({len(chunk)} mesaj): {error}")
+        return [{"status": "error", "message": error, "details": {"error": "RequestFailed"}} for _ in chunk]
+
+
+def tickets_summary(tickets: List[Dict]) -> Dict:
+    ok = sum(1 for ticket in tickets if ticket.get("status") == "ok")
+    return {"sent": ok, "failed": len(tickets) - ok}
+
+
 class NotificationService:
-    def __init__(self):
-        self.expo_api_url = "https://exp.host/--/api/v2/push/send"
-        self.session = requests.Session()
-        self.session.headers.update({
-            "Accept": "application/json",
-            "Accept-encoding": "gzip, deflate",
-            "Content-Type": "application/json"
-        })
-    
+    def __init__(self, client: Optional[ExpoPushClient] = None):
+        self.client = client or expo_push_client
+
     async def send_push_notification(self, message: ExpoPushMessage) -> Dict:
         """Tek bir push bildirimi gönder"""
         try:
-            payload = message.dict()
-            response = self.session.post(self.expo_api_url, json=payload)
-            
-            if response.status_code == 200:
-                result = response.json()
+            tickets = await self.client.send([message.dict()])
+            ticket = tickets[0]
+            if ticket.get("status") == "ok":
                 return {
                     "success": True,
-                    "data": result,
+                    "data": {"data": ticket},
                     "message": "Bildirim başarıyla gönderildi"
                 }
-            else:
-                return {
-                    "success": False,
-                    "error": f"HTTP {response.status_code}: {response.text}",
-                    "message": "Bildirim gönderilemedi"
-                }
+            return {
+                "success": False,
+                "error": ticket.get("message"),
+                "data": {"data": ticket},
+                "message": "Bildirim gönderilemedi"
+            }
         except Exception as e:
             return {
                 "success": False,
@@ -51,24 +167,22 @@ class NotificationService:
             }
     
     async def send_bulk_notifications(self, messages: List[ExpoPushMessage]) -> Dict:
-        """Toplu push bildirimi gönder"""
+        """Toplu push bildirimi gönder (100'lük parçalar halinde)"""
         try:
-            payload = [message.dict() for message in messages]
-            response = self.session.post(self.expo_api_url, json=payload)
-            
-            if response.status_code == 200:
-                result = response.json()
+            tickets = await self.client.send([message.dict() for message in messages])
+            summary = tickets_summary(tickets)
+            if summary["sent"]:
                 return {
                     "success": True,
-                    "data": result,
-                    "message": f"{len(messages)} bildirim gönderildi"
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": f"HTTP {response.status_code}: {response.text}",
-                    "message": "Toplu bildirim gönderilemedi"
+                    "data": {"data": tickets, **summary},
+                    "message": f"{summary['sent']}/{len(tickets)} bildirim gönderildi"
                 }
+            return {
+                "success": False,
+                "error": tickets[0].get("message") if tickets else "Mesaj yok",
+                "data": {"data": tickets, **summary},
+                "message": "Toplu bildirim gönderilemedi"
+            }
         except Exception as e:
             return {
                 "success": False,
@@ -136,4 +250,10 @@ class NotificationService:
         return await self.send_push_notification(notification)
 
 # Global instance
+expo_push_client = ExpoPushClient(
+    concurrency=settings.EXPO_PUSH_CONCURRENCY,
+    timeout=settings.EXPO_PUSH_TIMEOUT,
+    max_attempts=settings.EXPO_PUSH_MAX_ATTEMPTS,
+    access_token=settings.EXPO_ACCESS_TOKEN,
+)
 notification_service = NotificationService()
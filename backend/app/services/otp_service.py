@@ -0,0 +1,124 @@
+import hashlib
+import hmac
+import secrets
+
+from fastapi import HTTPException
+
+from ..core.config import settings
+from ..core.metrics import metrics
+from ..core.redis import get_redis
+from .sms_service import sms_queue
+
+# KEYS: kod, cooldown, gönderim sayacı
+# ARGV: kod hash'i, kod TTL, cooldown, pencere başına en fazla gönderim, pencere
+ISSUE_SCRIPT = """
+local cooldown = redis.call('PTTL', KEYS[2])
+if cooldown > 0 then
+    return {-1, cooldown}
+end
+local sends = redis.call('INCR', KEYS[3])
+if sends == 1 then
+    redis.call('EXPIRE', KEYS[3], ARGV[5])
+end
+if sends > tonumber(ARGV[4]) then
+    return {-2, redis.call('PTTL', KEYS[3])}
+end
+redis.call('DEL', KEYS[1])
+redis.call('HSET', KEYS[1], 'h', ARGV[1], 'a', 0)
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+redis.call('SET', KEYS[2], 1, 'EX', ARGV[3])
+return {1, 0}
+"""
+
+# KEYS: kod; ARGV: denenen kodun hash'i, en fazla deneme
+# 1 = doğru (kod silinir), 0 = kod yok/süresi dolmuş, -1 = yanlış, -2 = deneme hakkı bitti (kod silinir)
+VERIFY_SCRIPT = """
+local expected = redis.call('HGET', KEYS[1], 'h')
+if not expected then
+    return 0
+end
+if expected == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    return 1
+end
+local attempts = redis.call('HINCRBY', KEYS[1], 'a', 1)
+if attempts >= tonumber(ARGV[2]) then
+    redis.call('DEL', KEYS[1])
+    return -2
+end
+return -1
+"""
+
+VERIFY_ERRORS = {
+    0: "Kodun süresi dolmuş, lütfen yeni kod isteyin",
+    -1: "Geçersiz doğrulama kodu",
+    -2: "Çok fazla hatalı deneme, lütfen yeni kod isteyin",
+}
+
+
+class OtpService:
+    """Tek kullanımlık SMS kodları: Redis'te yalnızca HMAC'i tutulur; doğrulama tek Lua çağrısı"""
+
+    def __init__(self, length: int, ttl: int, max_attempts: int, cooldown: int, max_sends: int, window: int):
+        self.length = length
+        self.ttl = ttl
+        self.max_attempts = max_attempts
+        self.cooldown = cooldown
+        self.max_sends = max_sends
+        self.window = window
+        self._issue = None
+        self._verify = None
+
+    def _scripts(self):
+        # register_script EVALSHA kullanır, script cache'te yoksa EVAL ile yükler
+        if self._issue is None:
+            redis_client = get_redis()
+            self._issue = redis_client.register_script(ISSUE_SCRIPT)
+            self._verify = redis_client.register_script(VERIFY_SCRIPT)
+        return self._issue, self._verify
+
+    def _hash(self, purpose: str, phone: str, code: str) -> str:
+        message = f"{purpose}:{phone}:{code}".encode()
+        return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+    @staticmethod
+    def _keys(purpose: str, phone: str):
+        return [f"otp:{purpose}:{phone}", f"otp:cooldown:{purpose}:{phone}", f"otp:sends:{purpose}:{phone}"]
+
+    def send(self, phone: str, purpose: str = "login") -> dict:
+        """Kod üret, Redis'e yaz ve SMS kuyruğuna ekle (NetGSM beklenmez). Cooldown/limitte 429."""
+        code = f"{secrets.randbelow(10 ** self.length):0{self.length}d}"
+        issue, _ = self._scripts()
+        status, retry_ms = issue(
+            keys=self._keys(purpose, phone),
+            args=[self._hash(purpose, phone, code), self.ttl, self.cooldown, self.max_sends, self.window],
+        )
+        if status < 0:
+            metrics.incr("otp.throttled")
+            retry_after = max(1, int(retry_ms) // 1000)
+            detail = ("Yeni kod için lütfen bekleyin" if status == -1
+                      else "Çok fazla kod istendi, lütfen daha sonra tekrar deneyin")
+            raise HTTPException(status_code=429, detail=detail, headers={"Retry-After": str(retry_after)})
+
+        sms_queue.enqueue(phone, f"Kurban Cebimde doğrulama kodunuz: {code}. Kod {self.ttl // 60} dakika geçerlidir.")
+        metrics.incr("otp.sent")
+        return {"expires_in": self.ttl, "retry_after": self.cooldown}
+
+    def verify(self, phone: str, code: str, purpose: str = "login") -> None:
+        """Kodu doğrula (tek Redis round-trip); hatalıysa 400"""
+        _, verify = self._scripts()
+        result = verify(keys=self._keys(purpose, phone)[:1], args=[self._hash(purpose, phone, code.strip()), self.max_attempts])
+        if result != 1:
+            metrics.incr("otp.rejected")
+            raise HTTPException(status_code=400, detail=VERIFY_ERRORS.get(result, "Geçersiz doğrulama kodu"))
+        metrics.incr("otp.verified")
+
+
+otp_service = OtpService(
+    length=settings.OTP_LENGTH,
+    ttl=settings.OTP_TTL_SECONDS,
+    max_attempts=settings.OTP_MAX_ATTEMPTS,
+    cooldown=settings.OTP_RESEND_COOLDOWN,
+    max_sends=settings.OTP_MAX_SENDS_PER_HOUR,
+    window=3600,
+)
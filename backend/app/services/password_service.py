@@ -0,0 +1,97 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+import bcrypt
+from fastapi import HTTPException
+
+from ..core.config import settings
+from ..core.metrics import metrics
+
+
+# Şifresiz içe aktarılan kullanıcılar: hiçbir şifreyle eşleşmez (OTP/şifre sıfırlama ile aktive edilir)
+UNUSABLE_PASSWORD = "!"
+
+
+class PasswordPoolSaturated(HTTPException):
+    """Hash kuyruğu dolu; istemci kısa süre sonra tekrar denemeli"""
+
+    def __init__(self):
+        super().__init__(
+            status_code=429,
+            detail="Sunucu şu anda yoğun, lütfen birkaç saniye sonra tekrar deneyin",
+            headers={"Retry-After": "2"},
+        )
+
+
+class PasswordService:
+    """bcrypt hash/verify işlemlerini event loop dışında, sınırlı bir havuzda çalıştırır.
+
+    bcrypt hesaplama sırasında GIL'i bırakır; bu yüzden çekirdek sayısı kadar thread
+    process havuzunun IPC maliyeti olmadan paralel çalışır.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.capacity = workers + max_pending
+        self._in_flight = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        # Toplu import ayrı havuzda: login/register kuyruğunu aç bırakmaz
+        self._bulk_executor = ThreadPoolExecutor(max_workers=max(1, workers // 2), thread_name_prefix="bcrypt-bulk")
+
+    async def _run(self, name: str, func, *args):
+        # Event loop tek thread: kontrol ve artırma arasında await yok
+        if self._in_flight >= self.capacity:
+            metrics.incr("password.rejected")
+            raise PasswordPoolSaturated()
+        self._in_flight += 1
+        queued_at = time.perf_counter()
+
+        def timed():
+            started = time.perf_counter()
+            metrics.observe("password.queue_wait", started - queued_at)
+            try:
+                return func(*args)
+            finally:
+                metrics.observe(f"password.{name}", time.perf_counter() - started)
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, timed)
+        finally:
+            self._in_flight -= 1
+
+    async def hash(self, password: str) -> str:
+        hashed = await self._run("hash", bcrypt.hashpw, password.encode("utf-8"), bcrypt.gensalt())
+        return hashed.decode("utf-8")
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        if not password_hash or password_hash.startswith(UNUSABLE_PASSWORD):
+            return False
+        return await self._run("verify", bcrypt.checkpw, password.encode("utf-8"), password_hash.encode("utf-8"))
+
+    def hash_many(self, passwords: List[Optional[str]]) -> List[str]:
+        """Toplu hash (senkron, import thread'inden çağrılır); boş şifre kullanılamaz hash olur"""
+        hashed = [UNUSABLE_PASSWORD] * len(passwords)
+        indexes = [index for index, password in enumerate(passwords) if password]
+        if not indexes:
+            return hashed
+
+        def one(index: int) -> str:
+            return bcrypt.hashpw(passwords[index].encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+
+        start = time.perf_counter()
+        for index, value in zip(indexes, self._bulk_executor.map(one, indexes)):
+            hashed[index] = value
+        metrics.observe("password.hash_many", time.perf_counter() - start)
+        return hashed
+
+    def stats(self) -> dict:
+        return {"workers": self.workers, "capacity": self.capacity, "in_flight": self._in_flight}
+
+
+password_service = PasswordService(
+    workers=settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
@@ -0,0 +1,95 @@
+import asyncio
+import time
+from typing import Callable, Dict, Optional
+
+from ..core.config import settings
+from ..core.database import get_engine
+from ..core.metrics import metrics
+from ..core.redis import get_redis
+from ..core.schema import schema
+
+
+def _check_db() -> Dict:
+    # Paylaşılan pool üzerinden; probe başına yeni bağlantı açılmaz.
+    # Revizyon okuması hem bağlantıyı doğrular hem de migration sonrası şema haritasını yeniler.
+    with get_engine().connect() as conn:
+        revision = schema.sync_revision(conn)
+    return {"revision": revision}
+
+
+def _check_redis() -> Dict:
+    get_redis().ping()
+    return {}
+
+
+def _check_s3() -> Dict:
+    from .storage_service import storage_service
+
+    if not storage_service.bucket:
+        return {"status": "skipped", "detail": "S3_BUCKET tanımlı değil"}
+    storage_service.s3.head_bucket(Bucket=storage_service.bucket)
+    return {}
+
+
+class ReadinessService:
+    """DB, Redis ve S3 bağımlılıklarını kontrol eden, sonucu kısa süre önbellekleyen servis"""
+
+    def __init__(self, checks: Dict[str, Callable[[], Dict]], ttl: float, timeout: float, required: set):
+        self.checks = checks
+        self.ttl = ttl
+        self.timeout = timeout
+        self.required = required
+        self._cached: Optional[Dict] = None
+        self._cached_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def _run_check(self, name: str, check: Callable[[], Dict]) -> Dict:
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(asyncio.to_thread(check), timeout=self.timeout)
+            result = {"status": "ok", **result}
+        except asyncio.TimeoutError:
+            result = {"status": "fail", "detail": f"{self.timeout}s içinde yanıt yok"}
+        except Exception as e:
+            result = {"status": "fail", "detail": str(e)[:200]}
+        elapsed = time.perf_counter() - start
+        metrics.observe(f"readiness.{name}", elapsed)
+        if result["status"] == "fail":
+            metrics.incr(f"readiness.{name}.fail")
+        result["latency_ms"] = round(elapsed * 1000, 2)
+        return result
+
+    async def _evaluate(self) -> Dict:
+        names = list(self.checks)
+        results = await asyncio.gather(*(self._run_check(name, self.checks[name]) for name in names))
+        dependencies = dict(zip(names, results))
+        ready = all(dependencies[name]["status"] != "fail" for name in names if name in self.required)
+        degraded = any(result["status"] == "fail" for result in results)
+        return {
+            "status": "ok" if not degraded else ("degraded" if ready else "fail"),
+            "ready": ready,
+            "checked_at": int(time.time()),
+            "dependencies": dependencies,
+        }
+
+    async def check(self, force: bool = False) -> Dict:
+        """Önbellekteki sonucu döndür; TTL dolduysa tek bir kontrol turu çalıştır"""
+        now = time.monotonic()
+        if not force and self._cached is not None and now - self._cached_at < self.ttl:
+            return {**self._cached, "cached": True}
+        async with self._lock:
+            # Kilidi beklerken başka bir istek sonucu tazelemiş olabilir
+            now = time.monotonic()
+            if not force and self._cached is not None and now - self._cached_at < self.ttl:
+                return {**self._cached, "cached": True}
+            self._cached = await self._evaluate()
+            self._cached_at = time.monotonic()
+        return {**self._cached, "cached": False}
+
+
+readiness_service = ReadinessService(
+    checks={"db": _check_db, "redis": _check_redis, "s3": _check_s3},
+    ttl=settings.READINESS_CACHE_TTL,
+    timeout=settings.READINESS_TIMEOUT,
+    required={name.strip() for name in settings.READINESS_REQUIRED.split(",") if name.strip()},
+)
@@ -0,0 +1,222 @@
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import text
+
+from ..core.cache import TTLCache
+from ..core.config import settings
+from ..core.database import get_engine, get_read_engine
+from ..core.metrics import metrics
+from ..core.redis import get_redis
+from ..core.schema import schema
+
+logger = logging.getLogger(__name__)
+
+# user_id -> son aktivite (epoch saniye). Presence sorguları yalnızca buradan okunur.
+LAST_SEEN_KEY = "presence:last_seen"
+# Henüz user_sessions'a yazılmamış aktiviteler (write-behind kuyruğu)
+PENDING_KEY = "presence:pending"
+FLUSHING_PREFIX = "presence:flushing:"
+# İstek yolundaki touch'lar bellekte toplanır; flusher thread'i bu aralıkla Redis'e yazar
+TOUCH_PUSH_INTERVAL = 1.0
+# Redis uzun süre yoksa tamponda tutulan en fazla kullanıcı
+MAX_BUFFERED_TOUCHES = 100000
+
+# Aktiviteyi etkin oturuma işle; etkin oturum yoksa (boşta kalma süresi dolmuş) yenisini aç
+FLUSH_SQL = text("""
+    WITH batch AS (
+        SELECT b.user_id, b.seen_at
+        FROM unnest(CAST(:user_ids AS uuid[]), CAST(:seen_at AS timestamp[])) AS b(user_id, seen_at)
+        WHERE EXISTS (SELECT 1 FROM users u WHERE u.id = b.user_id)
+    ),
+    updated AS (
+        UPDATE user_sessions s
+        SET last_activity = GREATEST(COALESCE(s.last_activity, s.started_at), b.seen_at),
+            expires_at = GREATEST(s.expires_at, b.seen_at + make_interval(secs => :idle))
+        FROM batch b
+        WHERE s.user_id = b.user_id AND s.expires_at >= b.seen_at
+        RETURNING s.user_id
+    )
+    INSERT INTO user_sessions (user_id, session_token, started_at, last_activity, expires_at)
+    SELECT b.user_id, 'presence:' || gen_random_uuid(), b.seen_at, b.seen_at,
+           b.seen_at + make_interval(secs => :idle)
+    FROM batch b
+    WHERE b.user_id NOT IN (SELECT user_id FROM updated)
+""")
+
+LAST_SEEN_SQL = text("""
+    SELECT user_id, MAX(COALESCE(last_activity, started_at)) AS last_seen
+    FROM user_sessions
+    WHERE user_id = ANY(CAST(:user_ids AS uuid[]))
+    GROUP BY user_id
+""")
+
+
+def _is_uuid(value: str) -> bool:
+    try:
+        uuid.UUID(value)
+        return True
+    except ValueError:
+        return False
+
+
+class SessionService:
+    """Oturum/presence: son aktivite Redis sorted set'inde, user_sessions'a toplu yazılır"""
+
+    def __init__(self, touch_interval: float, online_window: float, flush_interval: float,
+                 idle_timeout: float, retention: float):
+        self.online_window = online_window
+        self.flush_interval = flush_interval
+        self.idle_timeout = idle_timeout
+        self.retention = retention
+        # Aynı kullanıcı için worker başına en fazla touch_interval'da bir Redis yazımı
+        self._recent = TTLCache("presence_touch", 10000, touch_interval)
+        self._touched: Dict[str, float] = {}
+        self._touched_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def touch(self, user_id: str) -> None:
+        """Kimliği doğrulanmış istekte kullanıcının aktivitesini işaretle (yalnızca bellek; Redis'e flusher yazar)"""
+        user_id = str(user_id)
+        if self._recent.get(user_id) is not None:
+            return
+        self._recent.set(user_id, True)
+        with self._touched_lock:
+            if len(self._touched) >= MAX_BUFFERED_TOUCHES and user_id not in self._touched:
+                metrics.incr("presence.touch_dropped")
+                return
+            self._touched[user_id] = time.time()
+
+    def push_touches(self) -> int:
+        """Tampondaki aktiviteleri tek pipeline ile Redis'e yaz; yazılamazsa tampona geri döner"""
+        with self._touched_lock:
+            touched, self._touched = self._touched, {}
+        if not touched:
+            return 0
+        try:
+            pipe = get_redis().pipeline(transaction=False)
+            pipe.zadd(LAST_SEEN_KEY, touched)
+            pipe.zadd(PENDING_KEY, touched)
+            pipe.execute()
+        except Exception:
+            with self._touched_lock:
+                # Bu arada gelen daha yeni touch'lar korunur
+                self._touched = {**touched, **self._touched}
+            raise
+        return len(touched)
+
+    def last_seen(self, user_ids: Iterable[str]) -> Dict[str, Optional[datetime]]:
+        """Bir sayfa kullanıcı için son aktivite: tek ZMSCORE; Redis yoksa tek gruplu sorgu"""
+        user_ids = [str(user_id) for user_id in user_ids]
+        if not user_ids:
+            return {}
+        try:
+            scores = get_redis().zmscore(LAST_SEEN_KEY, user_ids)
+            return {
+                user_id: datetime.utcfromtimestamp(score) if score is not None else None
+                for user_id, score in zip(user_ids, scores)
+            }
+        except Exception as e:
+            metrics.incr("presence.redis_fallback")
+            logger.warning(f"Presence Redis'ten okunamadı, user_sessions kullanılıyor: {e}")
+        return self._last_seen_from_db(user_ids)
+
+    def _last_seen_from_db(self, user_ids: List[str]) -> Dict[str, Optional[datetime]]:
+        result: Dict[str, Optional[datetime]] = dict.fromkeys(user_ids)
+        if not schema.has_column("user_sessions", "last_activity"):
+            return result
+        try:
+            with get_read_engine(settings.REPLICA_LIST_MAX_LAG_SECONDS).connect() as conn:
+                rows = conn.execute(LAST_SEEN_SQL, {"user_ids": [u for u in user_ids if _is_uuid(u)]})
+                for row in rows:
+                    result[str(row.user_id)] = row.last_seen
+        except Exception as e:
+            logger.warning(f"Presence user_sessions'tan okunamadı: {e}")
+        return result
+
+    def is_online(self, last_seen: Optional[datetime]) -> bool:
+        return last_seen is not None and (datetime.utcnow() - last_seen).total_seconds() < self.online_window
+
+    def flush(self) -> int:
+        """Bekleyen aktiviteleri user_sessions'a yaz; yazılan kullanıcı sayısını döndür"""
+        redis_client = get_redis()
+        # RENAME atomik: aynı kuyruğu birden fazla worker işlemez, bu arada gelen touch'lar yeni kuyruğa düşer
+        flushing = f"{FLUSHING_PREFIX}{uuid.uuid4()}"
+        try:
+            redis_client.rename(PENDING_KEY, flushing)
+        except Exception as e:
+            if "no such key" in str(e).lower():
+                return 0
+            raise
+        pending = redis_client.zrange(flushing, 0, -1, withscores=True)
+        batch = [(user_id, score) for user_id, score in pending if _is_uuid(user_id)]
+
+        start = time.perf_counter()
+        try:
+            if batch:
+                with get_engine().begin() as conn:
+                    conn.execute(FLUSH_SQL, {
+                        "user_ids": [user_id for user_id, _ in batch],
+                        "seen_at": [datetime.utcfromtimestamp(score) for _, score in batch],
+                        "idle": self.idle_timeout,
+                    })
+        except Exception:
+            # Yazılamayan aktiviteler kuyruğa geri döner (daha yeni bir touch varsa o korunur)
+            redis_client.zadd(PENDING_KEY, dict(pending), gt=True)
+            raise
+        finally:
+            redis_client.delete(flushing)
+        metrics.observe("presence.flush", time.perf_counter() - start)
+        redis_client.zremrangebyscore(LAST_SEEN_KEY, "-inf", time.time() - self.retention)
+        return len(batch)
+
+    def _flush_loop(self) -> None:
+        next_flush = time.monotonic() + self.flush_interval
+        while not self._stop.wait(TOUCH_PUSH_INTERVAL):
+            try:
+                self.push_touches()
+            except Exception as e:
+                metrics.incr("presence.touch_error")
+                logger.warning(f"Presence Redis'e yazılamadı: {e}")
+            if time.monotonic() < next_flush:
+                continue
+            next_flush = time.monotonic() + self.flush_interval
+            try:
+                self.flush()
+            except Exception as e:
+                metrics.incr("presence.flush_error")
+                logger.warning(f"Presence flush başarısız: {e}")
+
+    def start_flusher(self) -> None:
+        """Arka planda touch'ların Redis'e, periyodik olarak da user_sessions'a yazımı"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._flush_loop, name="presence-flush", daemon=True)
+        self._thread.start()
+
+    def stop_flusher(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=self.flush_interval)
+        self._thread = None
+        try:
+            self.push_touches()
+            self.flush()
+        except Exception as e:
+            logger.warning(f"Kapanışta presence flush başarısız: {e}")
+
+
+session_service = SessionService(
+    touch_interval=settings.PRESENCE_TOUCH_INTERVAL,
+    online_window=settings.PRESENCE_ONLINE_WINDOW,
+    flush_interval=settings.PRESENCE_FLUSH_INTERVAL,
+    idle_timeout=settings.SESSION_IDLE_TIMEOUT,
+    retention=settings.PRESENCE_RETENTION_DAYS * 86400,
+)
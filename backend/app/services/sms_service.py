@@ -0,0 +1,156 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import List, Optional
+
+import requests
+
+from ..core.config import settings
+from ..core.metrics import metrics
+from ..core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+# NetGSM Configuration
+NETGSM_USER = os.getenv("NETGSM_USER", "8503033128")
+NETGSM_PASS = os.getenv("NETGSM_PASS", "")
+NETGSM_HEADER = os.getenv("NETGSM_HEADER", "KURBANCB")
+NETGSM_URL = "https://api.netgsm.com.tr/sms/send/get/"
+
+
+def send_sms(to: str, message: str, header: Optional[str] = None) -> dict:
+    """NetGSM ile SMS gönder (senkron; istek yolunda değil SMS kuyruğu worker'ında çağrılır)"""
+    try:
+        # Telefon numarası formatı (90 ile başlamalı)
+        if not to.startswith("90"):
+            to = "90" + to.lstrip("0")
+        
+        # NetGSM API parametreleri
+        params = {
+            "usercode": NETGSM_USER,
+            "password": NETGSM_PASS,
+            "gsmno": to,
+            "msg": message,
+            "msgheader": header or NETGSM_HEADER,
+            "dil": "TR"  # Türkçe karakter desteği
+        }
+        
+        # Mesaj içeriği (OTP kodu olabilir) loglanmaz
+        print(f"📱 SMS gönderiliyor: {to} ({len(message)} karakter)")
+        print(f"🔑 NetGSM Params: usercode={NETGSM_USER}, password=***, gsmno={to}, header={header or NETGSM_HEADER}")
+        
+        # NetGSM API çağrısı - POST ile
+        response = requests.post(NETGSM_URL, data=params, timeout=30)
+        
+        print(f"📡 NetGSM Response: {response.status_code} - {response.text}")
+        
+        if response.status_code == 200:
+            result = response.text.strip()
+            
+            # Başarılı gönderim kontrolü
+            if result.isdigit() and len(result) > 5:
+                return {
+                    "success": True,
+                    "message_id": result,
+                    "error": None
+                }
+            else:
+                return {
+                    "success": False,
+                    "message_id": None,
+                    "error": f"NetGSM Error: {result}"
+                }
+        else:
+            return {
+                "success": False,
+                "message_id": None,
+                "error": f"HTTP Error: {response.status_code}"
+            }
+            
+    except Exception as e:
+        print(f"❌ SMS gönderim hatası: {e}")
+        return {
+            "success": False,
+            "message_id": None,
+            "error": str(e)
+        }
+
+
+QUEUE_KEY = "sms:queue"
+
+
+class SmsQueue:
+    """Redis listesi üzerinden SMS kuyruğu: istek yolu yalnızca LPUSH yapar, NetGSM çağrısını worker thread'leri yapar.
+
+    Kuyruk Redis'te olduğu için herhangi bir worker süreci işi alabilir; başarısız gönderim
+    max_attempts'e kadar kuyruğun sonuna geri eklenir.
+    """
+
+    def __init__(self, workers: int, max_attempts: int):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def enqueue(self, to: str, message: str) -> None:
+        job = {"to": to, "message": message, "attempt": 0, "queued_at": time.time()}
+        get_redis().lpush(QUEUE_KEY, json.dumps(job, ensure_ascii=False))
+        metrics.incr("sms.enqueued")
+
+    def _send(self, job: dict) -> None:
+        if not NETGSM_PASS:
+            metrics.incr("sms.skipped")
+            if settings.APP_PROFILE == "production":
+                logger.warning(f"NETGSM_PASS tanımlı değil, SMS gönderilmedi: {job['to']}")
+            else:
+                logger.info(f"[development] SMS gönderilmedi, içerik: {job['to']}: {job['message']}")
+            return
+
+        metrics.observe("sms.queue_wait", time.time() - job["queued_at"])
+        start = time.perf_counter()
+        result = send_sms(job["to"], job["message"])
+        metrics.observe("sms.send", time.perf_counter() - start)
+        if result["success"]:
+            metrics.incr("sms.sent")
+        elif job["attempt"] + 1 < self.max_attempts:
+            metrics.incr("sms.retry")
+            get_redis().lpush(QUEUE_KEY, json.dumps({**job, "attempt": job["attempt"] + 1}, ensure_ascii=False))
+        else:
+            metrics.incr("sms.failed")
+            logger.warning(f"SMS {self.max_attempts} denemede gönderilemedi: {job['to']}: {result['error']}")
+
+    def _work(self) -> None:
+        while not self._stop.is_set():
+            try:
+                item = get_redis().brpop(QUEUE_KEY, timeout=1)
+            except Exception as e:
+                logger.warning(f"SMS kuyruğu okunamadı: {e}")
+                self._stop.wait(1)
+                continue
+            if item is None:
+                continue
+            try:
+                self._send(json.loads(item[1]))
+            except Exception as e:
+                metrics.incr("sms.failed")
+                logger.warning(f"SMS işi işlenemedi: {e}")
+
+    def start_worker(self) -> None:
+        if self._threads:
+            return
+        self._stop.clear()
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"sms-queue-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop_worker(self) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=2)
+        self._threads = []
+
+
+sms_queue = SmsQueue(workers=settings.SMS_QUEUE_WORKERS, max_attempts=settings.SMS_MAX_ATTEMPTS)
@@ -3,9 +3,6 @@ import time
 import mimetypes
 from typing import Optional
 
-import boto3
-from botocore.client import Config
-
 ALLOWED_MIME_TYPES = {"image/jpeg", "image/png", "video/mp4"}
 
 class StorageService:
@@ -14,14 +11,24 @@ class StorageService:
         self.region = os.getenv("S3_REGION", "auto")
         self.base_url = os.getenv("S3_BASE_URL")  # optional CDN/base url
         self.expire_seconds = int(os.getenv("PRESIGN_EXPIRE_SEC", "900"))
-        self.s3 = boto3.client(
-            "s3",
-            region_name=self.region if self.region != "auto" else None,
-            endpoint_url=os.getenv("S3_ENDPOINT_URL"),  # R2/AWS compatible
-            aws_access_key_id=os.getenv("S3_ACCESS_KEY_ID"),
-            aws_secret_access_key=os.getenv("S3_SECRET_ACCESS_KEY"),
-            config=Config(signature_version="s3v4"),
-        )
+        self._s3 = None
+
+    @property
+    def s3(self):
+        # boto3 ağır bir import; client ilk kullanımda oluşturulur
+        if self._s3 is None:
+            import boto3
+            from botocore.client import Config
+
+            self._s3 = boto3.client(
+                "s3",
+                region_name=self.region if self.region != "auto" else None,
+                endpoint_url=os.getenv("S3_ENDPOINT_URL"),  # R2/AWS compatible
+                aws_access_key_id=os.getenv("S3_ACCESS_KEY_ID"),
+                aws_secret_access_key=os.getenv("S3_SECRET_ACCESS_KEY"),
+                config=Config(signature_version="s3v4"),
+            )
+        return self._s3
 
     def _validate_mime(self, mime_type: str) -> None:
         if mime_type not in ALLOWED_MIME_TYPES:
@@ -0,0 +1,214 @@
+import csv
+import io
+import itertools
+import logging
+import time
+import uuid
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from ..core.config import settings
+from ..core.database import get_engine
+from ..core.metrics import metrics
+from ..core.phone import normalize_phones
+from .password_service import password_service
+
+logger = logging.getLogger(__name__)
+
+# Kolon adı -> kabul edilen başlıklar (küçük harf)
+COLUMNS = {
+    "name": ("name", "ad", "isim"),
+    "surname": ("surname", "soyad", "soyisim"),
+    "phone": ("phone", "telefon", "tel", "gsm"),
+    "email": ("email", "e-posta", "eposta", "mail"),
+    "password": ("password", "şifre", "sifre"),
+}
+MAX_LENGTHS = {"name": 100, "surname": 100, "email": 255}
+# Yanıtta döndürülen satır hatası sayısı (toplam sayı her zaman döner)
+MAX_REPORTED_ERRORS = 1000
+
+STAGING_DDL = """
+    CREATE TEMP TABLE users_import (
+        row_no INTEGER NOT NULL,
+        id UUID NOT NULL,
+        name VARCHAR(100) NOT NULL,
+        surname VARCHAR(100) NOT NULL,
+        email VARCHAR(255),
+        phone VARCHAR(20) NOT NULL,
+        password_hash VARCHAR(255) NOT NULL
+    ) ON COMMIT DROP
+"""
+COPY_SQL = "COPY users_import (row_no, id, name, surname, email, phone, password_hash) FROM STDIN WITH (FORMAT csv)"
+# Mevcut telefon/e-posta ile çakışanlar (eşzamanlı kayıtlar dahil) atlanır ve raporlanır
+MERGE_SQL = """
+    INSERT INTO users (id, name, surname, email, phone, password_hash, role,
+                       is_admin, is_super_admin, is_active, created_at, updated_at)
+    SELECT id, name, surname, email, phone, password_hash, 'kullanıcı',
+           FALSE, FALSE, TRUE, NOW(), NOW()
+    FROM users_import
+    ORDER BY row_no
+    ON CONFLICT DO NOTHING
+    RETURNING id
+"""
+
+
+def _header_map(header: List) -> Dict[str, int]:
+    positions = {}
+    normalized = [str(cell or "").strip().lower() for cell in header]
+    for column, aliases in COLUMNS.items():
+        for index, cell in enumerate(normalized):
+            if cell in aliases:
+                positions[column] = index
+                break
+    missing = [column for column in ("name", "surname", "phone") if column not in positions]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Eksik kolon(lar): {', '.join(missing)}")
+    return positions
+
+
+def _csv_rows(file: BinaryIO) -> Iterator[List]:
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    first = text.readline()
+    # Excel'in Türkçe yerel ayarı CSV'yi ';' ile ayırır
+    delimiter = ";" if first.count(";") > first.count(",") else ","
+    yield from csv.reader(itertools.chain([first], text), delimiter=delimiter)
+
+
+def _xlsx_rows(file: BinaryIO) -> Iterator[List]:
+    # openpyxl yalnızca XLSX import'unda yüklenir
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        for row in workbook.active.iter_rows(values_only=True):
+            yield list(row)
+    finally:
+        workbook.close()
+
+
+class UserImportService:
+    """CSV/XLSX bağışçı listesini toplu içe aktarır: doğrulama -> toplu hash -> COPY -> merge"""
+
+    def __init__(self, max_rows: int):
+        self.max_rows = max_rows
+
+    def _read(self, file: BinaryIO, filename: str) -> Tuple[Dict[str, int], List[Tuple[int, List]]]:
+        if filename.lower().endswith(".xlsx"):
+            rows = _xlsx_rows(file)
+        elif filename.lower().endswith(".csv"):
+            rows = _csv_rows(file)
+        else:
+            raise HTTPException(status_code=400, detail="Yalnızca .csv veya .xlsx dosyası yüklenebilir")
+
+        header = next(rows, None)
+        if header is None:
+            raise HTTPException(status_code=400, detail="Dosya boş")
+        positions = _header_map(header)
+
+        records = []
+        # Satır numaraları dosyadaki gibi: başlık 1. satır
+        for row_no, row in enumerate(rows, start=2):
+            if not any(cell not in (None, "") for cell in row):
+                continue
+            if len(records) >= self.max_rows:
+                raise HTTPException(status_code=413, detail=f"En fazla {self.max_rows} satır içe aktarılabilir")
+            records.append((row_no, row))
+        return positions, records
+
+    def _validate(self, positions: Dict[str, int], records: List[Tuple[int, List]]):
+        def column(row: List, name: str) -> Optional[str]:
+            index = positions.get(name)
+            if index is None or index >= len(row) or row[index] is None:
+                return None
+            value = str(row[index]).strip()
+            return value or None
+
+        phone_index = positions["phone"]
+        phones = normalize_phones(row[phone_index] if phone_index < len(row) else None for _, row in records)
+
+        valid, errors = [], []
+        seen_phones: Dict[str, int] = {}
+        seen_emails: Dict[str, int] = {}
+        for (row_no, row), phone in zip(records, phones):
+            name, surname = column(row, "name"), column(row, "surname")
+            email = column(row, "email")
+            email = email.lower() if email else None
+
+            if not name or not surname:
+                error = "Ad ve soyad zorunlu"
+            elif phone is None:
+                error = "Geçersiz telefon numarası"
+            elif email and "@" not in email:
+                error = "Geçersiz e-posta"
+            elif any(len(value or "") > MAX_LENGTHS[key] for key, value in
+                     (("name", name), ("surname", surname), ("email", email))):
+                error = "Alan uzunluğu sınırı aşıldı"
+            elif phone in seen_phones:
+                error = f"Telefon dosyada tekrar ediyor (satır {seen_phones[phone]})"
+            elif email and email in seen_emails:
+                error = f"E-posta dosyada tekrar ediyor (satır {seen_emails[email]})"
+            else:
+                seen_phones[phone] = row_no
+                if email:
+                    seen_emails[email] = row_no
+                valid.append([row_no, str(uuid.uuid4()), name, surname, email, phone, column(row, "password")])
+                continue
+            errors.append({"row": row_no, "error": error})
+        return valid, errors
+
+    def _load(self, valid: List[List]) -> set:
+        """Staging tabloya COPY + tek INSERT ... SELECT; eklenen id'leri döndür"""
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(valid)
+        buffer.seek(0)
+
+        conn = get_engine().raw_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(STAGING_DDL)
+            cursor.copy_expert(COPY_SQL, buffer)
+            cursor.execute(MERGE_SQL)
+            inserted = {str(row[0]) for row in cursor.fetchall()}
+            conn.commit()
+            return inserted
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def run(self, file: BinaryIO, filename: str) -> Dict:
+        """Senkron; istek handler'ı thread'de çalıştırır"""
+        start = time.perf_counter()
+        positions, records = self._read(file, filename)
+        valid, errors = self._validate(positions, records)
+
+        if valid:
+            # Şifre kolonu boşsa kullanılamaz hash (OTP/şifre sıfırlama ile aktive edilir)
+            hashes = password_service.hash_many([record[6] for record in valid])
+            for record, password_hash in zip(valid, hashes):
+                record[6] = password_hash
+            inserted = self._load(valid)
+            for record in valid:
+                if record[1] not in inserted:
+                    errors.append({"row": record[0], "error": "Telefon veya e-posta zaten kayıtlı"})
+        else:
+            inserted = set()
+
+        errors.sort(key=lambda error: error["row"])
+        elapsed = time.perf_counter() - start
+        metrics.observe("users.import", elapsed)
+        metrics.incr("users.import.rows", len(inserted))
+        logger.info(f"Kullanıcı import: {len(records)} satır, {len(inserted)} eklendi, {len(errors)} hata, {elapsed:.1f}s")
+        return {
+            "total": len(records),
+            "imported": len(inserted),
+            "failed": len(errors),
+            "errors": errors[:MAX_REPORTED_ERRORS],
+            "errors_truncated": len(errors) > MAX_REPORTED_ERRORS,
+            "elapsed_ms": round(elapsed * 1000, 1),
+        }
+
+
+user_import_service = UserImportService(max_rows=settings.USER_IMPORT_MAX_ROWS)
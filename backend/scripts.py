@@ -101,7 +101,7 @@ def setup_database():
     """Database kurulumu"""
     print("🗄️ Database kurulumu...")
     commands = [
-        ("python -c \"from app.main import create_tables; create_tables()\"", "Tabloları oluşturma"),
+        ("alembic upgrade head", "Migration'ları çalıştırma"),
         ("python create_admin.py", "Admin kullanıcı oluşturma")
     ]
     
@@ -0,0 +1,79 @@
+"""
+İstek başına auth maliyeti: her çağrıda jwt.decode (eski get_current_user) ile
+önbellekli ortak bağımlılığın (app.core.security) karşılaştırması.
+
+Mobil istemci gibi az sayıda token'ın tekrar tekrar geldiği bir trafik üretir;
+--tokens ile farklı token sayısı, --calls ile toplam çağrı sayısı ayarlanır.
+
+Kullanım:
+    python scripts/bench_jwt_auth.py --calls 200000 --tokens 50
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import jwt  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.security import clear_token_cache, get_current_claims, get_current_user_id  # noqa: E402
+
+
+def legacy_get_current_user(authorization: str) -> str:
+    """Eski users.py/donations.py davranışı: her çağrıda imza doğrulama"""
+    token = authorization.split(" ")[1]
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
+    return payload.get("user_id") or payload.get("sub")
+
+
+def cached_get_current_user(authorization: str) -> str:
+    return get_current_user_id(get_current_claims(authorization))
+
+
+def make_headers(count: int):
+    headers = []
+    for index in range(count):
+        payload = {
+            "user_id": f"user-{index}",
+            "role": "kullanıcı",
+            "is_admin": False,
+            "is_super_admin": False,
+            "exp": datetime.utcnow() + timedelta(hours=24),
+            "iat": datetime.utcnow(),
+        }
+        headers.append("Bearer " + jwt.encode(payload, settings.SECRET_KEY, algorithm="HS256"))
+    return headers
+
+
+def run(label: str, handler, headers, calls: int) -> float:
+    start = time.perf_counter()
+    for index in range(calls):
+        handler(headers[index % len(headers)])
+    per_call_us = (time.perf_counter() - start) / calls * 1_000_000
+    print(f"{label:<28} {per_call_us:>8.2f} µs/istek   ({calls} çağrı)")
+    return per_call_us
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="JWT auth bağımlılığı benchmark'ı")
+    parser.add_argument("--calls", type=int, default=100_000)
+    parser.add_argument("--tokens", type=int, default=50, help="Farklı token sayısı")
+    args = parser.parse_args()
+
+    headers = make_headers(args.tokens)
+    print(f"{args.tokens} farklı token, {args.calls} çağrı\n")
+
+    before = run("jwt.decode her istekte", legacy_get_current_user, headers, args.calls)
+    clear_token_cache()
+    # İlk görüşler (miss) ayrı ölçülür; sonrası önbellekten
+    run("önbellek (ilk görüş)", cached_get_current_user, headers, len(headers))
+    after = run("önbellek (tekrar)", cached_get_current_user, headers, args.calls)
+
+    print(f"\nHızlanma: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
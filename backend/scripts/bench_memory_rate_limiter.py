@@ -0,0 +1,92 @@
+"""
+Süreç içi rate limiter benchmark'ı: eski anahtar başına zaman damgası listesi ile
+LRU sınırlı GCRA (LocalGcra).
+
+İki senaryoda istek başına süreyi ölçer: --keys farklı anahtara (varsayılan 1M istemci
+IP'si) yayılmış trafik ve az sayıda yoğun anahtar (--hot-keys; eski yöntemde liste limit
+boyuna kadar büyür). Ardından 1M anahtar için tracemalloc ile tepe belleği yazdırır.
+
+Kullanım:
+    python scripts/bench_memory_rate_limiter.py --keys 1000000 --requests 1000000
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from typing import Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.middleware.rate_limiter import LocalGcra  # noqa: E402
+
+
+class LegacyMemoryLimiter:
+    """Eski _memory_check: anahtar başına liste, her istekte yeniden kurulur, anahtar hiç atılmaz"""
+
+    def __init__(self):
+        self.memory_storage: Dict[str, Dict] = {}
+
+    def check(self, key: str, limit: int, window: int) -> bool:
+        current_time = int(time.time())
+        window_start = current_time - window
+        if key not in self.memory_storage:
+            self.memory_storage[key] = {"requests": [], "last_cleanup": current_time}
+        storage = self.memory_storage[key]
+        storage["requests"] = [req_time for req_time in storage["requests"] if req_time > window_start]
+        if len(storage["requests"]) >= limit:
+            return False
+        storage["requests"].append(current_time)
+        return True
+
+    def __len__(self) -> int:
+        return len(self.memory_storage)
+
+
+def timed(factory, keys, requests: int, limit: int, window: int) -> float:
+    check = factory().check
+    count = len(keys)
+    start = time.perf_counter()
+    for index in range(requests):
+        check(keys[index % count], limit, window)
+    return (time.perf_counter() - start) / requests * 1_000_000
+
+
+def peak_memory(factory, keys, limit: int, window: int):
+    tracemalloc.start()
+    limiter = factory()
+    for key in keys:
+        limiter.check(key, limit, window)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, len(limiter)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Süreç içi rate limiter benchmark'ı")
+    parser.add_argument("--keys", type=int, default=1_000_000, help="Farklı anahtar (IP) sayısı")
+    parser.add_argument("--requests", type=int, default=1_000_000)
+    parser.add_argument("--hot-keys", type=int, default=100, help="Yoğun trafik senaryosundaki anahtar sayısı")
+    parser.add_argument("--max-keys", type=int, default=100_000, help="LocalGcra anahtar sınırı")
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--window", type=int, default=3600)
+    args = parser.parse_args()
+
+    keys = [f"rate_limit:ip:10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}:{i}" for i in range(args.keys)]
+    hot_keys = keys[: args.hot_keys]
+    limiters = [
+        ("liste (eski)", LegacyMemoryLimiter),
+        (f"GCRA + LRU ({args.max_keys})", lambda: LocalGcra(args.max_keys)),
+    ]
+    print(f"limit {args.limit}/{args.window}s, {args.requests} istek\n")
+    print(f"{'':<26} {args.keys} anahtar   {args.hot_keys} anahtar   tepe bellek ({args.keys} anahtar)")
+    for label, factory in limiters:
+        spread = timed(factory, keys, args.requests, args.limit, args.window)
+        hot = timed(factory, hot_keys, args.requests, args.limit, args.window)
+        peak, kept = peak_memory(factory, keys, args.limit, args.window)
+        print(f"{label:<26} {spread:>8.2f} µs/istek {hot:>8.2f} µs/istek   "
+              f"{peak / 2**20:>7.1f} MiB, {kept} anahtar tutuluyor")
+
+
+if __name__ == "__main__":
+    main()
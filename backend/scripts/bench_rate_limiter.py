@@ -0,0 +1,122 @@
+"""
+Redis rate limiter benchmark'ı: eski 4 komutluk ZSET pipeline'ı, tek EVALSHA GCRA (strict)
+ve yerel kovalar + toplu mutabakat (hybrid).
+
+Hedef hızda (--rate, varsayılan 10k istek/sn) --threads thread'den istek üretir ve
+ulaşılan hızı, gecikme yüzdeliklerini ve izin verilen istek sayısını yazdırır.
+Aynı saniyedeki istekler eski yöntemde tek ZSET üyesine çöktüğü için sayılmaz;
+GCRA'da izin verilen sayı limite eşit olmalıdır; hybrid'de en fazla SYNC_MAX_PENDING +
+SYNC_INTERVAL içinde gelen istek kadar aşabilir.
+
+Kullanım:
+    python scripts/bench_rate_limiter.py --redis-url redis://localhost:6379/15
+    python scripts/bench_rate_limiter.py --fake   # Redis yoksa (yalnızca doğruluk; süreler anlamsız)
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import redis  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.middleware.rate_limiter import CustomRateLimiter, HybridRateLimiter  # noqa: E402
+
+
+def legacy_check(client, key: str, limit: int, window: int) -> bool:
+    """Eski _redis_check: saniye çözünürlüklü ZSET üyesi, 4 komut"""
+    current_time = int(time.time())
+    pipe = client.pipeline()
+    pipe.zremrangebyscore(key, 0, current_time - window)
+    pipe.zcard(key)
+    pipe.zadd(key, {str(current_time): current_time})
+    pipe.expire(key, window)
+    return pipe.execute()[1] < limit
+
+
+def run(label: str, check, rate: int, seconds: float, threads: int, keys: int) -> None:
+    per_thread = rate / threads
+    latencies = [[] for _ in range(threads)]
+    allowed = [0] * threads
+
+    def worker(index: int) -> None:
+        start = time.perf_counter()
+        sent = 0
+        while True:
+            # Açık döngü: her thread kendi payına düşen hızda istek üretir
+            due = start + sent / per_thread
+            now = time.perf_counter()
+            if due - start >= seconds:
+                return
+            if due > now:
+                time.sleep(due - now)
+            began = time.perf_counter()
+            if check(f"bench:rate:{(index * 7919 + sent) % keys}"):
+                allowed[index] += 1
+            latencies[index].append(time.perf_counter() - began)
+            sent += 1
+
+    pool = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+    started = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    samples = sorted(latency for chunk in latencies for latency in chunk)
+    count = len(samples)
+    p50 = samples[count // 2] * 1000
+    p99 = samples[int(count * 0.99)] * 1000
+    print(f"{label:<18} {count / elapsed:>9.0f} istek/sn   p50 {p50:6.3f} ms   p99 {p99:6.3f} ms   "
+          f"izin: {sum(allowed)}/{count}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Redis rate limiter benchmark'ı")
+    parser.add_argument("--redis-url", default=os.getenv("REDIS_URL", "redis://localhost:6379/15"))
+    parser.add_argument("--fake", action="store_true", help="fakeredis kullan")
+    parser.add_argument("--rate", type=int, default=10_000, help="Hedef istek/sn")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--keys", type=int, default=100, help="Farklı anahtar (istemci) sayısı")
+    parser.add_argument("--limit", type=int, default=1000, help="Anahtar başına pencere limiti")
+    parser.add_argument("--window", type=int, default=3600)
+    args = parser.parse_args()
+
+    if args.fake:
+        import fakeredis
+
+        client = fakeredis.FakeRedis(decode_responses=True)
+    else:
+        pool = redis.ConnectionPool.from_url(args.redis_url, max_connections=args.threads, decode_responses=True)
+        client = redis.Redis(connection_pool=pool)
+        client.ping()
+
+    limiter = CustomRateLimiter(client)
+    expected = min(args.keys * args.limit, int(args.rate * args.seconds))
+    print(f"hedef {args.rate} istek/sn, {args.seconds:g} sn, {args.threads} thread, {args.keys} anahtar, "
+          f"limit {args.limit}/{args.window}s (beklenen izin ~{expected})\n")
+
+    client.delete(*[f"bench:rate:{index}" for index in range(args.keys)])
+    run("ZSET pipeline", lambda key: legacy_check(client, key, args.limit, args.window),
+        args.rate, args.seconds, args.threads, args.keys)
+    client.delete(*[f"bench:rate:{index}" for index in range(args.keys)])
+    run("GCRA (EVALSHA)", lambda key: limiter.is_allowed(key, args.limit, args.window)[0],
+        args.rate, args.seconds, args.threads, args.keys)
+    client.delete(*[f"bench:rate:{index}" for index in range(args.keys)])
+
+    hybrid = HybridRateLimiter(client, settings.RATE_LIMIT_SYNC_INTERVAL_MS / 1000,
+                               settings.RATE_LIMIT_SYNC_MAX_PENDING, args.keys)
+    hybrid.start()
+    run("hybrid (yerel)", lambda key: hybrid.check(key, args.limit, args.window)[0],
+        args.rate, args.seconds, args.threads, args.keys)
+    hybrid.stop()
+    client.delete(*[f"bench:rate:{index}" for index in range(args.keys)])
+
+
+if __name__ == "__main__":
+    main()
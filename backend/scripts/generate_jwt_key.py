@@ -0,0 +1,67 @@
+"""
+JWT imza anahtarı üretir: <dizin>/<kid>.pem (private, PKCS8).
+
+Rotasyon: yeni anahtarı üretip dağıtın (adı en büyük private key aktif olur). Eski
+anahtarın private'ını, onunla imzalanmış token'lar bitene kadar (refresh ömrü) yalnızca
+public olarak bırakın:
+
+    python scripts/generate_jwt_key.py --dir /run/secrets/jwt
+    python scripts/generate_jwt_key.py --dir /run/secrets/jwt --retire 2026-01-01
+
+Kullanım:
+    python scripts/generate_jwt_key.py --dir keys --alg EdDSA
+    python scripts/generate_jwt_key.py --dir keys --alg RS256 --kid 2026-10-18-rsa
+"""
+import argparse
+import os
+from datetime import datetime
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+
+
+def generate(algorithm: str):
+    if algorithm == "EdDSA":
+        return ed25519.Ed25519PrivateKey.generate()
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def retire(directory: str, kid: str) -> None:
+    """Private key'i public key ile değiştir: doğrulamaya devam eder, artık imzalamaz"""
+    path = os.path.join(directory, f"{kid}.pem")
+    with open(path, "rb") as f:
+        private_key = serialization.load_pem_private_key(f.read(), password=None)
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    with open(path, "wb") as f:
+        f.write(public_pem)
+    print(f"🔒 {kid} emekliye ayrıldı (yalnızca doğrulama)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="JWT imza anahtarı üret")
+    parser.add_argument("--dir", required=True)
+    parser.add_argument("--alg", choices=["EdDSA", "RS256"], default="EdDSA")
+    parser.add_argument("--kid", default=datetime.utcnow().strftime("%Y-%m-%d"))
+    parser.add_argument("--retire", metavar="KID", help="Yeni anahtar üretmek yerine bu anahtarı public'e indir")
+    args = parser.parse_args()
+
+    if args.retire:
+        retire(args.dir, args.retire)
+        return
+
+    os.makedirs(args.dir, exist_ok=True)
+    path = os.path.join(args.dir, f"{args.kid}.pem")
+    if os.path.exists(path):
+        raise SystemExit(f"{path} zaten var")
+    pem = generate(args.alg).private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    with os.fdopen(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), "wb") as f:
+        f.write(pem)
+    print(f"🔑 {path} ({args.alg}) oluşturuldu; JWT_KEYS_DIR={args.dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+`python -X importtime` çıktısından açılış import süresi dökümü.
+
+Uygulamayı ayrı bir süreçte import eder, stderr'deki importtime satırlarını
+üst seviye pakete göre toplar ve toplam süre bütçeyi aşarsa 1 ile çıkar.
+
+Kullanım:
+    python scripts/import_time_report.py --profile production --budget-ms 1500
+    python scripts/import_time_report.py --module app.main --top 30
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# import time:     self [us] | cumulative | imported package
+LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def collect(module: str, profile: str) -> List[Tuple[str, int, int, int]]:
+    """(modül, self_us, cumulative_us, derinlik) listesi"""
+    env = {**os.environ, "APP_PROFILE": profile, "SCHEMA_CHECK": "off"}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        tail = "\n".join(line for line in proc.stderr.splitlines() if not line.startswith("import time:"))
+        raise SystemExit(f"{module} import edilemedi:\n{tail}")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            depth = (len(match.group(3)) - 1) // 2
+            rows.append((match.group(4), int(match.group(1)), int(match.group(2)), depth))
+    return rows
+
+
+def summarize(rows: List[Tuple[str, int, int, int]]) -> Dict[str, int]:
+    """Üst seviye paket başına self süre toplamı (µs)"""
+    packages: Dict[str, int] = {}
+    for name, self_us, _, _ in rows:
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + self_us
+    return packages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Açılış import süresi raporu")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--profile", default=os.getenv("APP_PROFILE", "production"))
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("IMPORT_BUDGET_MS", "0")),
+                        help="Toplam import süresi bütçesi (0 = kontrol yok)")
+    args = parser.parse_args()
+
+    rows = collect(args.module, args.profile)
+    total_ms = sum(self_us for _, self_us, _, _ in rows) / 1000
+    packages = summarize(rows)
+
+    print(f"Profil: {args.profile}   modül: {args.module}   toplam: {total_ms:.1f}ms   ({len(rows)} modül)")
+    print(f"\n{'paket':<32} {'self (ms)':>10} {'pay':>6}")
+    for package, self_us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"{package:<32} {self_us / 1000:>10.1f} {self_us / 1000 / total_ms:>6.1%}")
+
+    # Hedef modülün doğrudan import ettikleri (derinlik 1): hangi import zinciri pahalı
+    print(f"\n{'doğrudan importlar (kümülatif)':<52} {'ms':>8}")
+    direct = [row for row in rows if row[3] == 1]
+    for name, _, cumulative_us, _ in sorted(direct, key=lambda row: row[2], reverse=True)[:args.top]:
+        print(f"{name:<52} {cumulative_us / 1000:>8.1f}")
+
+    if args.budget_ms and total_ms > args.budget_ms:
+        print(f"\n❌ Import süresi bütçeyi aşıyor: {total_ms:.1f}ms > {args.budget_ms:.0f}ms")
+        sys.exit(1)
+    if args.budget_ms:
+        print(f"\n✅ Bütçe içinde: {total_ms:.1f}ms <= {args.budget_ms:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
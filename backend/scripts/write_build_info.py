@@ -0,0 +1,50 @@
+"""
+Image build sırasında app/_build_info.py üretir; /version bu modülü bellekten sunar.
+
+Kullanım (Dockerfile):
+    ARG GIT_SHA
+    ARG BUILD_TIME
+    RUN python scripts/write_build_info.py
+
+Değerler sırasıyla argüman, ortam değişkeni (APP_VERSION, GIT_SHA, BUILD_TIME)
+ve lokal git deposundan alınır.
+"""
+import argparse
+import os
+import subprocess
+from datetime import datetime, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUTPUT = os.path.join(BACKEND_DIR, "app", "_build_info.py")
+
+
+def _git_sha() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=BACKEND_DIR, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return "unknown"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build metadata modülü üret")
+    parser.add_argument("--version", default=os.getenv("APP_VERSION") or "1.0.0")
+    parser.add_argument("--git-sha", default=os.getenv("GIT_SHA") or None)
+    parser.add_argument("--build-time", default=os.getenv("BUILD_TIME") or None)
+    parser.add_argument("--output", default=OUTPUT)
+    args = parser.parse_args()
+
+    git_sha = args.git_sha or _git_sha()
+    build_time = args.build_time or datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write("# Otomatik üretildi: scripts/write_build_info.py (elle düzenlemeyin)\n")
+        f.write(f"VERSION = {args.version!r}\n")
+        f.write(f"GIT_SHA = {git_sha!r}\n")
+        f.write(f"BUILD_TIME = {build_time!r}\n")
+    print(f"✅ {args.output}: {args.version} {git_sha[:8]} {build_time}")
+
+
+if __name__ == "__main__":
+    main()
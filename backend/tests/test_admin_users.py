@@ -0,0 +1,72 @@
+import time
+import uuid
+
+import fakeredis
+import pytest
+
+import app.core.redis as redis_module
+import app.routers.admin as admin
+from app.services.session_service import LAST_SEEN_KEY
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class FakeEngine:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def connect(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, *args):
+        return FakeResult(self.rows)
+
+
+@pytest.fixture
+def users(monkeypatch):
+    redis_client = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(redis_module, "_client", redis_client)
+    monkeypatch.setattr(admin.schema, "has_table", lambda table: True)
+    monkeypatch.setattr(admin.schema, "compiled", lambda key, builder: None)
+
+    def serve(rows):
+        monkeypatch.setattr(admin, "get_read_engine", lambda max_lag=None: FakeEngine(rows))
+        return redis_client
+    return serve
+
+
+@pytest.mark.asyncio
+async def test_list_users_empty(users):
+    users([])
+
+    response = await admin.list_users("token")
+
+    assert response.items == [] and response.total == 0
+
+
+@pytest.mark.asyncio
+async def test_list_users_adds_presence_to_every_row(users):
+    rows = [{"id": uuid.uuid4(), "name": f"user{index}"} for index in range(3)]
+    redis_client = users(rows)
+    redis_client.zadd(LAST_SEEN_KEY, {str(rows[1]["id"]): time.time()})
+
+    response = await admin.list_users("token")
+
+    assert response.total == 3
+    assert [item["is_online"] for item in response.items] == [False, True, False]
+    assert all({"last_seen", "is_active"} <= item.keys() for item in response.items)
@@ -0,0 +1,12 @@
+from app.core.build_info import config_hash
+from app.core.config import settings
+
+
+def test_config_hash_ignores_secrets():
+    changed = settings.model_copy(update={
+        "SECRET_KEY": "other-secret",
+        "DATABASE_URL": "postgresql://other:pass@db/other",
+        "REDIS_URL": "redis://:pass@other:6379/0",
+    })
+    assert config_hash(changed) == config_hash(settings)
+    assert config_hash(settings.model_copy(update={"DB_POOL_SIZE": 99})) != config_hash(settings)
@@ -0,0 +1,83 @@
+import asyncio
+import gzip
+import json
+
+import httpx
+import pytest
+
+from app.services.notification_service import ExpoPushClient, ExpoPushMessage, NotificationService
+
+
+class FakeExpo:
+    """Expo push endpoint'i: 100'den fazla mesajı reddeder, 'bad' token'lara hata ticket'ı döner"""
+
+    def __init__(self, fail_first: int = 0):
+        self.fail_first = fail_first
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        body = request.content
+        if request.headers.get("content-encoding") == "gzip":
+            body = gzip.decompress(body)
+        messages = json.loads(body)
+        self.requests.append((request.headers.get("content-encoding"), len(messages)))
+        if self.fail_first:
+            self.fail_first -= 1
+            return httpx.Response(503, text="unavailable")
+        if len(messages) > 100:
+            return httpx.Response(400, json={"errors": [{"code": "PUSH_TOO_MANY_NOTIFICATIONS"}]})
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return httpx.Response(200, json={"data": [
+            {"status": "error", "message": "not registered", "details": {"error": "DeviceNotRegistered"}}
+            if message["to"].startswith("bad") else {"status": "ok", "id": f"ticket-{message['to']}"}
+            for message in messages
+        ]})
+
+
+@pytest.mark.asyncio
+async def test_chunks_to_100_with_bounded_concurrency():
+    expo = FakeExpo()
+    client = ExpoPushClient(concurrency=2, transport=httpx.MockTransport(expo))
+    tokens = [f"ExponentPushToken[{index}]" for index in range(249)] + ["bad-token"]
+
+    tickets = await client.send([{"to": tokens, "title": "t", "body": "b"}])
+    await client.aclose()
+
+    assert sorted(count for _, count in expo.requests) == [50, 100, 100]
+    assert all(encoding == "gzip" for encoding, _ in expo.requests)
+    assert expo.max_in_flight == 2
+    assert [ticket["to"] for ticket in tickets] == tokens
+    assert tickets[0] == {"to": tokens[0], "status": "ok", "id": f"ticket-{tokens[0]}"}
+    assert tickets[-1]["details"]["error"] == "DeviceNotRegistered"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_sends_share_one_budget():
+    expo = FakeExpo()
+    client = ExpoPushClient(concurrency=2, transport=httpx.MockTransport(expo))
+    batches = [[{"to": f"ExponentPushToken[{caller}-{index}]", "title": "t", "body": "b"} for index in range(150)]
+               for caller in range(3)]
+
+    results = await asyncio.gather(*(client.send(batch) for batch in batches))
+    await client.aclose()
+
+    assert expo.max_in_flight == 2
+    assert all(ticket["status"] == "ok" for tickets in results for ticket in tickets)
+
+
+@pytest.mark.asyncio
+async def test_service_retries_unavailable_expo():
+    expo = FakeExpo(fail_first=1)
+    service = NotificationService(ExpoPushClient(transport=httpx.MockTransport(expo)))
+
+    result = await service.send_push_notification(ExpoPushMessage(to="ExponentPushToken[x]", title="t", body="b"))
+
+    assert result["success"]
+    assert result["data"]["data"]["id"] == "ticket-ExponentPushToken[x]"
+    # Küçük gövde sıkıştırılmadan gönderilir
+    assert expo.requests == [(None, 1), (None, 1)]
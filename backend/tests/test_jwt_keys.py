@@ -0,0 +1,95 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+
+from app.core.config import settings
+from app.core.jwt_keys import KeyRing
+
+PAYLOAD = {"sub": "u1", "exp": int(time.time()) + 60}
+
+
+def write_pem(directory, kid, key, public_only=False):
+    if public_only:
+        data = key.public_key().public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo)
+    else:
+        data = key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption())
+    (directory / f"{kid}.pem").write_bytes(data)
+
+
+def hs256(payload, secret, kid):
+    """PyJWT PEM anahtarla HS256 imzalamayı reddettiği için elle imzalanır"""
+    def segment(data: bytes) -> str:
+        return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+    signing_input = ".".join(segment(json.dumps(part).encode()) for part in ({"alg": "HS256", "typ": "JWT", "kid": kid}, payload))
+    signature = hmac.new(secret.encode(), signing_input.encode(), hashlib.sha256).digest()
+    return f"{signing_input}.{segment(signature)}"
+
+
+@pytest.fixture
+def keys_dir(tmp_path):
+    ed_key = ed25519.Ed25519PrivateKey.generate()
+    rsa_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    retired = ed25519.Ed25519PrivateKey.generate()
+    write_pem(tmp_path, "2026-01-01", retired, public_only=True)
+    write_pem(tmp_path, "2026-05-01", rsa_key)
+    write_pem(tmp_path, "2026-10-01", ed_key)
+    return tmp_path, retired, rsa_key
+
+
+def test_newest_private_key_signs_and_jwks_lists_all(keys_dir):
+    directory, _, _ = keys_dir
+    ring = KeyRing.from_directory(str(directory), None, accept_hs256=False)
+
+    token = ring.encode(PAYLOAD)
+
+    assert jwt.get_unverified_header(token)["kid"] == "2026-10-01"
+    assert ring.decode(token)["sub"] == "u1"
+    jwks = {key["kid"]: key for key in ring.jwks()["keys"]}
+    assert (jwks["2026-10-01"]["alg"], jwks["2026-10-01"]["kty"], jwks["2026-10-01"]["crv"]) == ("EdDSA", "OKP", "Ed25519")
+    assert (jwks["2026-05-01"]["alg"], jwks["2026-05-01"]["kty"]) == ("RS256", "RSA")
+    assert all("d" not in key for key in jwks.values())
+
+
+def test_retired_public_key_verifies_but_never_signs(keys_dir):
+    directory, retired, _ = keys_dir
+    token = jwt.encode(PAYLOAD, retired, algorithm="EdDSA", headers={"kid": "2026-01-01"})
+
+    ring = KeyRing.from_directory(str(directory), None, accept_hs256=False)
+    assert ring.decode(token)["sub"] == "u1"
+    with pytest.raises(ValueError):
+        KeyRing.from_directory(str(directory), "2026-01-01", accept_hs256=False)
+
+
+def test_algorithm_is_pinned_to_kid(keys_dir):
+    directory, _, rsa_key = keys_dir
+    ring = KeyRing.from_directory(str(directory), None, accept_hs256=True)
+    public_pem = rsa_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo)
+
+    # Geçerli kid taşıyan HS256 token'lar (SECRET_KEY ya da public key ile imzalı) reddedilir
+    for secret, kid in ((settings.SECRET_KEY, "2026-10-01"), (public_pem.decode(), "2026-05-01")):
+        with pytest.raises(jwt.InvalidTokenError):
+            ring.decode(hs256(PAYLOAD, secret, kid))
+    with pytest.raises(jwt.InvalidTokenError, match="Bilinmeyen anahtar"):
+        ring.decode(jwt.encode(PAYLOAD, rsa_key, algorithm="RS256", headers={"kid": "unknown"}))
+
+
+def test_kid_less_tokens_follow_accept_hs256(keys_dir):
+    directory, _, _ = keys_dir
+    legacy = jwt.encode(PAYLOAD, settings.SECRET_KEY, algorithm="HS256")
+
+    assert KeyRing.from_directory(str(directory), None, accept_hs256=True).decode(legacy)["sub"] == "u1"
+    with pytest.raises(jwt.InvalidTokenError):
+        KeyRing.from_directory(str(directory), None, accept_hs256=False).decode(legacy)
+    # Anahtar yoksa HS256 tek seçenek: kapatılamaz
+    assert KeyRing([], None, accept_hs256=False).decode(legacy)["sub"] == "u1"
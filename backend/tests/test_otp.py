@@ -0,0 +1,131 @@
+import json
+import re
+
+import bcrypt
+import fakeredis
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+import app.core.redis as redis_module
+import app.routers.admin as admin
+import app.routers.auth as auth
+from app.main import app
+from app.services.otp_service import OtpService, otp_service
+from app.services.sms_service import QUEUE_KEY
+
+PHONE = "5321234567"
+
+
+@pytest.fixture
+def redis_client(monkeypatch):
+    client = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(redis_module, "_client", client)
+    return client
+
+
+@pytest.fixture
+def otp(redis_client):
+    return OtpService(length=6, ttl=180, max_attempts=3, cooldown=60, max_sends=5, window=3600)
+
+
+def sent_code(redis_client) -> str:
+    job = json.loads(redis_client.rpop(QUEUE_KEY))
+    return re.search(r"\d{6}", job["message"]).group()
+
+
+def test_code_is_single_use_and_stored_hashed(otp, redis_client):
+    otp.send(PHONE)
+    code = sent_code(redis_client)
+    assert code not in json.dumps(redis_client.hgetall(f"otp:login:{PHONE}"))
+
+    otp.verify(PHONE, code)
+    with pytest.raises(HTTPException):
+        otp.verify(PHONE, code)
+
+
+def test_attempts_exhaust_code(otp, redis_client):
+    otp.send(PHONE)
+    code = sent_code(redis_client)
+    wrong = "000000" if code != "000000" else "111111"
+    for _ in range(3):
+        with pytest.raises(HTTPException):
+            otp.verify(PHONE, wrong)
+    # Deneme hakkı bitince doğru kod da geçmez
+    with pytest.raises(HTTPException):
+        otp.verify(PHONE, code)
+
+
+def test_resend_cooldown(otp):
+    otp.send(PHONE)
+    with pytest.raises(HTTPException) as error:
+        otp.send(PHONE)
+    assert error.value.status_code == 429
+    assert int(error.value.headers["Retry-After"]) > 0
+
+
+@pytest.fixture
+def client(redis_client, monkeypatch):
+    # Global servis script'leri ilk kullanımda o anki Redis istemcisine bağlar
+    monkeypatch.setattr(otp_service, "_issue", None)
+    monkeypatch.setattr(otp_service, "_verify", None)
+    return TestClient(app)
+
+
+def test_otp_send_endpoint_returns_retry_after(client, monkeypatch):
+    async def registered(phone):
+        return phone == PHONE
+    monkeypatch.setattr(auth, "_phone_registered", registered)
+
+    assert client.post("/api/v1/auth/otp/send", json={"phone": PHONE}).status_code == 200
+
+    response = client.post("/api/v1/auth/otp/send", json={"phone": PHONE})
+
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 0
+
+
+def test_otp_send_skips_unknown_numbers(client, redis_client, monkeypatch):
+    async def registered(phone):
+        return False
+    monkeypatch.setattr(auth, "_phone_registered", registered)
+
+    responses = [client.post("/api/v1/auth/otp/send", json={"phone": PHONE}) for _ in range(2)]
+
+    assert [response.status_code for response in responses] == [200, 200]
+    assert responses[0].json() == {"success": True, "expires_in": otp_service.ttl, "retry_after": otp_service.cooldown}
+    assert redis_client.llen(QUEUE_KEY) == 0
+
+
+class FakeUsers:
+    def __init__(self, user):
+        self.user = user
+
+    def connect(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, *args):
+        return self
+
+    def fetchone(self):
+        return self.user
+
+
+def test_admin_login_signals_otp_step(client, monkeypatch):
+    user = type("User", (), dict(
+        id="u1", name="Admin", surname="Kullanıcı", email="admin@example.com", phone=PHONE, role="admin",
+        password_hash=bcrypt.hashpw(b"secret", bcrypt.gensalt(4)).decode(), is_admin=True, is_super_admin=False,
+    ))
+    monkeypatch.setattr(admin, "engine", FakeUsers(user))
+    monkeypatch.setattr(admin.core_settings, "ADMIN_OTP_REQUIRED", True)
+
+    response = client.post("/api/admin/v1/auth/login", json={"phoneOrEmail": "admin@example.com", "password": "secret"})
+
+    assert response.status_code == 401
+    assert response.headers["X-OTP-Required"] == "true"
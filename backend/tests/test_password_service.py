@@ -0,0 +1,15 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.password_service import password_service
+
+
+def test_saturated_pool_returns_retry_after(monkeypatch):
+    monkeypatch.setattr(password_service, "capacity", 0)
+
+    response = TestClient(app).post("/api/v1/auth/register", json={
+        "name": "Ali", "surname": "Veli", "phone": "5321234567", "password": "secret123",
+    })
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "2"
@@ -0,0 +1,24 @@
+import pytest
+from fastapi import HTTPException
+
+from app.core.permissions import Permission, claims_permissions, permissions_for, require_permission
+
+
+def test_panel_access_requires_admin_flags():
+    assert not permissions_for("admin") & Permission.ADMIN_PANEL
+    assert permissions_for("kullanıcı", is_admin=True) & Permission.ADMIN_PANEL
+    assert permissions_for("publisher") & Permission.STREAMS_MANAGE
+    assert not permissions_for("viewer") & Permission.USERS_VIEW
+
+
+def test_legacy_claims_without_perms():
+    assert claims_permissions({"is_super_admin": True}) == permissions_for("", True, True)
+    assert claims_permissions({"perms": int(Permission.DASHBOARD_VIEW)}) == Permission.DASHBOARD_VIEW
+
+
+def test_require_permission_checks_all_bits():
+    check = require_permission(Permission.USERS_VIEW | Permission.USERS_UPDATE)
+    with pytest.raises(HTTPException) as error:
+        check({"perms": int(Permission.USERS_VIEW)})
+    assert error.value.status_code == 403
+    assert check({"perms": permissions_for("admin", is_admin=True)})
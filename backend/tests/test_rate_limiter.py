@@ -0,0 +1,131 @@
+import json
+
+import fakeredis
+import pytest
+from starlette.requests import Request
+
+from app.core.rate_limit_policies import PolicyTable, RateLimit, RateLimitPolicy
+from app.middleware.rate_limiter import CustomRateLimiter, HeavyHitters, HybridRateLimiter, LocalGcra
+
+
+@pytest.fixture
+def limiter():
+    return CustomRateLimiter(fakeredis.FakeRedis(decode_responses=True))
+
+
+def test_allows_burst_up_to_limit_then_rejects(limiter):
+    results = [limiter.is_allowed("rate_limit:ip:1.2.3.4", 5, 60) for _ in range(6)]
+
+    assert [allowed for allowed, _ in results] == [True] * 5 + [False]
+    assert [info["remaining"] for _, info in results[:5]] == [4, 3, 2, 1, 0]
+    # Bir sonraki hak window / limit = 12 saniye sonra
+    assert 11 <= results[-1][1]["retry_after"] <= 12
+
+
+def test_keys_are_independent(limiter):
+    assert limiter.is_allowed("rate_limit:ip:a", 1, 60)[0]
+    assert not limiter.is_allowed("rate_limit:ip:a", 1, 60)[0]
+    assert limiter.is_allowed("rate_limit:ip:b", 1, 60)[0]
+
+
+def test_falls_back_to_memory_when_redis_fails():
+    limiter = CustomRateLimiter(fakeredis.FakeRedis(decode_responses=True, connected=False))
+    assert limiter.is_allowed("rate_limit:ip:c", 1, 60)[0]
+    assert not limiter.is_allowed("rate_limit:ip:c", 1, 60)[0]
+
+
+def test_memory_limiter_evicts_least_recently_used():
+    memory = LocalGcra(max_keys=2)
+    memory.check("a", 1, 60)
+    memory.check("b", 1, 60)
+    assert not memory.check("a", 1, 60)[0]  # "a" yeniden en son kullanılan
+    memory.check("c", 1, 60)
+
+    assert len(memory) == 2
+    assert memory.check("b", 1, 60)[0]  # "b" atıldı, kotası baştan
+    assert not memory.check("c", 1, 60)[0]
+
+
+def test_hybrid_buckets_reconcile_through_redis():
+    client = fakeredis.FakeRedis(decode_responses=True)
+    workers = [HybridRateLimiter(client, sync_interval=1.0, max_pending=100, max_keys=100) for _ in range(2)]
+
+    # Her worker kendi görüşüyle 3 istek kabul eder; mutabakattan sonra diğerinin tüketimini de görür
+    for worker in workers:
+        assert all(worker.check("rate_limit:ip:d", 10, 60)[0] for _ in range(3))
+        worker.sync()
+    assert workers[0].check("rate_limit:ip:d", 10, 60)[1] == 6  # henüz yalnızca kendi tüketimi
+    workers[0].sync()
+
+    assert workers[0].check("rate_limit:ip:d", 10, 60)[1] == 2
+
+
+def test_policy_table_first_match_wins():
+    table = PolicyTable([
+        ("POST", "/api/v1/auth/login", RateLimitPolicy("login", (RateLimit(5, 60),))),
+        ("GET", "/api/certificates/v1/verify/{code}", RateLimitPolicy("verify", (RateLimit(5, 60),))),
+        ("*", "/api/*", RateLimitPolicy("api", (RateLimit(100, 60),))),
+    ])
+
+    assert table.match("POST", "/api/v1/auth/login").name == "login"
+    assert table.match("GET", "/api/v1/auth/login").name == "api"
+    assert table.match("GET", "/api/certificates/v1/verify/ABC123").name == "verify"
+    assert table.match("GET", "/api/certificates/v1/verify/ABC123/extra").name == "api"
+    assert table.match("GET", "/health") is None
+
+
+def test_heavy_hitters_rank_and_escalate():
+    tracker = HeavyHitters(window=60, top_k=3, escalate_threshold=50, escalate_seconds=60)
+    for index in range(1000):
+        tracker.add(f"ip:10.0.{index % 250}.1")
+        if index % 10 == 0:
+            tracker.add("ip:6.6.6.6", 2)
+
+    snapshot = tracker.snapshot()
+    assert snapshot["current"][0] == {"key": "ip:6.6.6.6", "estimate": 200}
+    assert [item["key"] for item in snapshot["escalated"]] == ["ip:6.6.6.6"]
+    assert tracker.add("ip:6.6.6.6")
+    assert not tracker.add("ip:10.0.1.1")
+
+
+def test_first_request_allowed_despite_float_rounding(monkeypatch):
+    # Bu saatte (now + 60) - 60 > now kayan noktada
+    now = 524246.7371394422
+    assert (now + 60) - 60 > now
+    monkeypatch.setattr("app.middleware.rate_limiter.time.monotonic", lambda: now)
+    assert LocalGcra(max_keys=10).check("a", 1, 60)[0]
+    assert HybridRateLimiter(None, 1.0, 100, 10).check("a", 1, 60)[0]
+
+
+def login_request(body: dict, ip: str = "203.0.113.7") -> Request:
+    payload = json.dumps(body).encode()
+
+    async def receive():
+        return {"type": "http.request", "body": payload, "more_body": False}
+
+    return Request({"type": "http", "method": "POST", "path": "/api/v1/auth/login", "headers": [],
+                    "client": (ip, 1234)}, receive)
+
+
+@pytest.mark.asyncio
+async def test_phone_limit_keys_on_account_not_ip(limiter):
+    policy = RateLimitPolicy("login", (RateLimit(20, 60), RateLimit(3, 900, "phone")))
+
+    # Aynı IP arkasındaki farklı e-posta hesapları hesap limitine takılmaz
+    for index in range(5):
+        assert (await limiter.check_policy(login_request({"phoneOrEmail": f"u{index}@example.com"}), policy))[0]
+    results = [
+        (await limiter.check_policy(login_request({"phoneOrEmail": " Ali@Example.com "}, f"10.0.0.{index}"), policy))[0]
+        for index in range(4)
+    ]
+    assert results == [True, True, True, False]
+    # Hesap bilgisi yoksa yalnızca IP limiti uygulanır
+    assert (await limiter.check_policy(login_request({"username": "x"}), policy))[0]
+
+
+@pytest.mark.asyncio
+async def test_email_account_key_is_bounded(limiter):
+    account = await limiter.get_account(login_request({"phoneOrEmail": "A" * 200 + "@Example.com"}))
+    assert account == await limiter.get_account(login_request({"phoneOrEmail": "a" * 200 + "@example.com "}))
+    assert len(account) == len("email:") + 32
+    assert await limiter.get_account(login_request({"phoneOrEmail": "a" * 300 + "@example.com"})) is None
@@ -0,0 +1,32 @@
+import fakeredis
+import pytest
+import redis
+
+import app.core.redis as redis_module
+from app.services.session_service import LAST_SEEN_KEY, PENDING_KEY, SessionService
+
+
+@pytest.fixture
+def service():
+    return SessionService(touch_interval=60, online_window=300, flush_interval=30, idle_timeout=1800, retention=86400)
+
+
+class DownRedis:
+    def pipeline(self, **kwargs):
+        raise redis.ConnectionError("Redis yok")
+
+
+def test_touch_is_buffered_until_redis_is_reachable(service, monkeypatch):
+    monkeypatch.setattr(redis_module, "_client", DownRedis())
+    service.touch("u1")
+    service.touch("u1")  # touch_interval içinde tekrar yazılmaz
+    with pytest.raises(redis.ConnectionError):
+        service.push_touches()
+
+    client = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(redis_module, "_client", client)
+    service.touch("u2")
+
+    assert service.push_touches() == 2
+    assert set(client.zrange(LAST_SEEN_KEY, 0, -1)) == set(client.zrange(PENDING_KEY, 0, -1)) == {"u1", "u2"}
+    assert service.push_touches() == 0
@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+import fakeredis
+import jwt
+import pytest
+
+import app.core.redis as redis_module
+from app.core.revocation import BloomFilter, RevocationList
+from app.core import security
+
+
+@pytest.fixture
+def revocation(monkeypatch):
+    monkeypatch.setattr(redis_module, "_client", fakeredis.FakeRedis(decode_responses=True))
+    revocation = RevocationList(1 << 16, 7)
+    monkeypatch.setattr(security, "revocation_list", revocation)
+    security.clear_token_cache()
+    return revocation
+
+
+def test_rotation_issues_single_use_tokens(revocation):
+    first = security.create_refresh_token("user-1")
+    claims = security.rotate_refresh_token(first)
+    second = security.create_refresh_token("user-1", claims["fam"])
+
+    assert security.rotate_refresh_token(second)["fam"] == claims["fam"]
+
+
+def test_reuse_revokes_whole_family(revocation):
+    family = security.new_token_family()
+    first = security.create_refresh_token("user-1", family)
+    security.rotate_refresh_token(first)
+    second = security.create_refresh_token("user-1", family)
+    access = security.encode_token({"user_id": "user-1", "type": "access", "fam": family}, timedelta(hours=1))
+    assert security.decode_token(access)["user_id"] == "user-1"
+
+    # Çalınan eski token tekrar kullanılırsa hem saldırgan hem meşru istemci düşer
+    with pytest.raises(security.RevokedTokenError):
+        security.rotate_refresh_token(first)
+    with pytest.raises(security.RevokedTokenError):
+        security.rotate_refresh_token(second)
+    with pytest.raises(jwt.InvalidTokenError):
+        security.decode_token(access)
+
+
+def test_legacy_refresh_token_is_single_use(revocation):
+    legacy = jwt.encode({"user_id": "user-1", "exp": 2_000_000_000}, security.settings.SECRET_KEY, algorithm="HS256")
+    assert security.rotate_refresh_token(legacy)["user_id"] == "user-1"
+    with pytest.raises(security.RevokedTokenError):
+        security.rotate_refresh_token(legacy)
+
+
+def test_legacy_access_token_cannot_refresh(revocation):
+    legacy_access = jwt.encode(
+        {"user_id": "user-1", "role": "kullanıcı", "is_admin": False, "is_super_admin": False,
+         "exp": 2_000_000_000, "iat": 1_700_000_000},
+        security.settings.SECRET_KEY, algorithm="HS256",
+    )
+    with pytest.raises(jwt.InvalidTokenError):
+        security.rotate_refresh_token(legacy_access)
+
+
+def test_logout_revokes_cached_access_token(revocation):
+    family = security.new_token_family()
+    access = security.encode_token({"user_id": "user-1", "type": "access", "fam": family}, timedelta(hours=1))
+    claims = security.decode_token(access)
+
+    security.revoke_token_family(claims)
+    with pytest.raises(security.RevokedTokenError):
+        security.decode_token(access)
+
+
+def test_not_revoked_check_skips_redis(revocation, monkeypatch):
+    def unreachable():
+        raise AssertionError("Bloom negatifken Redis'e gidilmemeli")
+
+    monkeypatch.setattr("app.core.revocation.get_redis", unreachable)
+    assert not revocation.is_revoked({"fam": "unknown-family", "jti": "unknown-jti"})
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1 << 16, 7)
+    items = [f"fam:{i}" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+    assert all(item in bloom for item in items)
+    false_positives = sum(f"other:{i}" in bloom for i in range(10000))
+    assert false_positives < 100
@@ -0,0 +1,81 @@
+import asyncio
+import io
+
+import bcrypt
+import pytest
+from fastapi import HTTPException
+from openpyxl import Workbook
+
+from app.services.password_service import UNUSABLE_PASSWORD, password_service
+from app.services.user_import_service import UserImportService
+
+service = UserImportService(max_rows=10)
+
+
+def validate(content: str, filename: str = "users.csv"):
+    positions, records = service._read(io.BytesIO(content.encode("utf-8-sig")), filename)
+    return service._validate(positions, records)
+
+
+def test_semicolon_csv_with_turkish_headers():
+    valid, errors = validate(
+        "Ad;Soyad;Telefon;E-posta;Şifre\n"
+        "Ayşe;Yılmaz;0532 123 45 67;AYSE@example.com;gizli\n"
+        "\n"
+        "Mehmet;Demir;+90 (533) 765 43 21;;\n"
+    )
+
+    assert errors == []
+    assert [(row[0], row[2], row[4], row[5], row[6]) for row in valid] == [
+        (2, "Ayşe", "ayse@example.com", "5321234567", "gizli"),
+        (4, "Mehmet", None, "5337654321", None),
+    ]
+
+
+def test_comma_csv_reports_row_numbers():
+    valid, errors = validate(
+        "name,surname,phone,email\n"
+        "Ali,Veli,5321234567,ali@example.com\n"
+        "Can,Kaya,12345,\n"
+        "Ece,Su,0532-123-4567,\n"
+        "Deniz,Ak,5339998877,ALI@example.com\n"
+        "Ege,Er,5330001122,not-an-email\n"
+        ",Boş,5330001133,\n"
+    )
+
+    assert [row[0] for row in valid] == [2]
+    assert errors == [
+        {"row": 3, "error": "Geçersiz telefon numarası"},
+        {"row": 4, "error": "Telefon dosyada tekrar ediyor (satır 2)"},
+        {"row": 5, "error": "E-posta dosyada tekrar ediyor (satır 2)"},
+        {"row": 6, "error": "Geçersiz e-posta"},
+        {"row": 7, "error": "Ad ve soyad zorunlu"},
+    ]
+
+
+def test_xlsx_and_header_errors():
+    workbook = Workbook()
+    workbook.active.append(["isim", "soyisim", "gsm"])
+    workbook.active.append(["Ali", "Veli", 5321234567])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    buffer.seek(0)
+    positions, records = service._read(buffer, "USERS.XLSX")
+    assert service._validate(positions, records)[0][0][5] == "5321234567"
+
+    with pytest.raises(HTTPException) as error:
+        validate("ad,telefon\nAli,5321234567\n")
+    assert error.value.detail == "Eksik kolon(lar): surname"
+    with pytest.raises(HTTPException) as error:
+        validate("ad,soyad,telefon\n" + "Ali,Veli,5321234567\n" * 11)
+    assert error.value.status_code == 413
+
+
+def test_hash_many_and_unusable_password():
+    hashes = password_service.hash_many(["gizli", None, ""])
+
+    assert bcrypt.checkpw(b"gizli", hashes[0].encode())
+    assert hashes[1:] == [UNUSABLE_PASSWORD, UNUSABLE_PASSWORD]
+    assert not asyncio.run(password_service.verify("", hashes[1]))
+    assert not asyncio.run(password_service.verify("!", UNUSABLE_PASSWORD))
+    assert asyncio.run(password_service.verify("gizli", hashes[0]))
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, contains_eager
 from app.core.database import get_db
 from app.models.stream import Stream
 from app.models.user import User
@@ -22,7 +22,10 @@ async def get_streams(
     """Get all streams (admin only)"""
     from app.models.donation import Donation
     
-    query = db.query(Stream).join(Donation, Stream.donation_id == Donation.id, isouter=True)
+    query = db.query(Stream).join(Donation, Stream.donation_id == Donation.id, isouter=True).options(
+        # JOIN zaten yapılıyor; satır başına lazy load (N+1) yerine aynı sonuçtan doldur
+        contains_eager(Stream.donation)
+    )
     
     # Status filter
     if status:
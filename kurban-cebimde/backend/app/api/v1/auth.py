@@ -8,6 +8,7 @@ from app.models.user import User
 from app.schemas.auth import UserRegister, UserLogin, Token, UserResponse
 from datetime import timedelta
 from app.core.config import settings
+from app.core.otp import otp_store
 
 router = APIRouter()
 security = HTTPBearer()
@@ -75,17 +76,14 @@ async def send_otp(request: dict, db: Session = Depends(get_db)):
             detail="Geçersiz telefon numarası"
         )
     
-    # Generate OTP (for testing, use 123456)
-    otp_code = "123456"
-    
-    # TODO: Implement SMS sending with NetGSM
-    # For now, just return success
+    # Kod Redis'te yalnızca HMAC olarak tutulur; yanıtta dönmez, SMS ile gider
+    result = otp_store.send(normalized_phone)
     
     return {
         "success": True,
         "message": "OTP gönderildi",
         "phone": normalized_phone,
-        "otp": otp_code  # Remove this in production
+        **result
     }
 
 @router.post("/otp/verify", response_model=dict)
@@ -103,12 +101,12 @@ async def verify_otp(request: dict, db: Session = Depends(get_db)):
             detail="Geçersiz telefon numarası"
         )
     
-    # For testing, accept any OTP
-    if otp != "123456":
+    if not otp:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Geçersiz OTP kodu"
         )
+    otp_store.verify(normalized_phone, otp)
     
     # Check if user exists
     user = db.query(User).filter(User.phone == normalized_phone).first()
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, contains_eager
 from app.core.database import get_db
 from app.models.stream import Stream
 from app.models.user import User
@@ -18,7 +18,10 @@ router = APIRouter()
 async def get_streams(db: Session = Depends(get_db)):
     """Get all streams (public)"""
     
-    streams = db.query(Stream).join(Donation, Stream.donation_id == Donation.id, isouter=True).filter(
+    streams = db.query(Stream).join(Donation, Stream.donation_id == Donation.id, isouter=True).options(
+        # JOIN zaten yapılıyor; satır başına lazy load (N+1) yerine aynı sonuçtan doldur
+        contains_eager(Stream.donation)
+    ).filter(
         Stream.status.in_(["scheduled", "live"])
     ).all()
     
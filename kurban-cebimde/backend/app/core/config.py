@@ -15,6 +15,14 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = "sqlite:///./test.db"
+
+    # Redis (OTP kodları; SMS'ler ana backend'in sms:queue kuyruğundan gönderilir)
+    REDIS_URL: str = "redis://localhost:6379/0"
+    OTP_LENGTH: int = 6
+    OTP_TTL_SECONDS: int = 180
+    OTP_MAX_ATTEMPTS: int = 5
+    OTP_RESEND_COOLDOWN: int = 60
+    OTP_MAX_SENDS_PER_HOUR: int = 5
     
     # CORS
     CORS_ORIGINS: List[str] = [
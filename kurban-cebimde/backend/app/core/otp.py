@@ -0,0 +1,131 @@
+import hashlib
+import hmac
+import json
+import secrets
+import time
+from typing import Optional
+
+import redis
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+
+# Ana backend'in SMS worker'ı bu listeden okur (aynı Redis paylaşıldığında SMS gönderilir)
+SMS_QUEUE_KEY = "sms:queue"
+
+# KEYS: kod, cooldown, gönderim sayacı
+# ARGV: kod hash'i, kod TTL, cooldown, pencere başına en fazla gönderim, pencere
+ISSUE_SCRIPT = """
+local cooldown = redis.call('PTTL', KEYS[2])
+if cooldown > 0 then
+    return {-1, cooldown}
+end
+local sends = redis.call('INCR', KEYS[3])
+if sends == 1 then
+    redis.call('EXPIRE', KEYS[3], ARGV[5])
+end
+if sends > tonumber(ARGV[4]) then
+    return {-2, redis.call('PTTL', KEYS[3])}
+end
+redis.call('DEL', KEYS[1])
+redis.call('HSET', KEYS[1], 'h', ARGV[1], 'a', 0)
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+redis.call('SET', KEYS[2], 1, 'EX', ARGV[3])
+return {1, 0}
+"""
+
+# KEYS: kod; ARGV: denenen kodun hash'i, en fazla deneme
+# 1 = doğru (kod silinir), 0 = kod yok/süresi dolmuş, -1 = yanlış, -2 = deneme hakkı bitti (kod silinir)
+VERIFY_SCRIPT = """
+local expected = redis.call('HGET', KEYS[1], 'h')
+if not expected then
+    return 0
+end
+if expected == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    return 1
+end
+local attempts = redis.call('HINCRBY', KEYS[1], 'a', 1)
+if attempts >= tonumber(ARGV[2]) then
+    redis.call('DEL', KEYS[1])
+    return -2
+end
+return -1
+"""
+
+VERIFY_ERRORS = {
+    0: "Kodun süresi dolmuş, lütfen yeni kod isteyin",
+    -1: "Geçersiz OTP kodu",
+    -2: "Çok fazla hatalı deneme, lütfen yeni kod isteyin",
+}
+
+
+class OtpStore:
+    """One-time SMS codes kept in Redis as HMACs only (never the plain code)"""
+
+    def __init__(self, redis_url: str, length: int = 6, ttl: int = 180, max_attempts: int = 5,
+                 cooldown: int = 60, max_sends: int = 5, window: int = 3600):
+        self.redis_url = redis_url
+        self.length = length
+        self.ttl = ttl
+        self.max_attempts = max_attempts
+        self.cooldown = cooldown
+        self.max_sends = max_sends
+        self.window = window
+        self._client: Optional[redis.Redis] = None
+        self._issue = None
+        self._verify = None
+
+    def _redis(self) -> redis.Redis:
+        if self._client is None:
+            self._client = redis.Redis.from_url(self.redis_url, decode_responses=True, socket_timeout=2)
+            self._issue = self._client.register_script(ISSUE_SCRIPT)
+            self._verify = self._client.register_script(VERIFY_SCRIPT)
+        return self._client
+
+    def _hash(self, phone: str, code: str) -> str:
+        return hmac.new(settings.SECRET_KEY.encode(), f"login:{phone}:{code}".encode(), hashlib.sha256).hexdigest()
+
+    @staticmethod
+    def _keys(phone: str):
+        return [f"otp:login:{phone}", f"otp:cooldown:login:{phone}", f"otp:sends:login:{phone}"]
+
+    def send(self, phone: str) -> dict:
+        """Generate a code, store its hash and queue the SMS; 429 on cooldown/limit"""
+        code = f"{secrets.randbelow(10 ** self.length):0{self.length}d}"
+        client = self._redis()
+        result, retry_ms = self._issue(
+            keys=self._keys(phone),
+            args=[self._hash(phone, code), self.ttl, self.cooldown, self.max_sends, self.window],
+        )
+        if result < 0:
+            detail = ("Yeni kod için lütfen bekleyin" if result == -1
+                      else "Çok fazla kod istendi, lütfen daha sonra tekrar deneyin")
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=detail,
+                headers={"Retry-After": str(max(1, int(retry_ms) // 1000))},
+            )
+        message = f"Kurban Cebimde doğrulama kodunuz: {code}. Kod {self.ttl // 60} dakika geçerlidir."
+        client.lpush(SMS_QUEUE_KEY, json.dumps(
+            {"to": phone, "message": message, "attempt": 0, "queued_at": time.time()}, ensure_ascii=False
+        ))
+        return {"expires_in": self.ttl, "retry_after": self.cooldown}
+
+    def verify(self, phone: str, code: str) -> None:
+        """Check the code in a single Lua call; 400 if it is wrong or expired"""
+        self._redis()
+        result = self._verify(keys=self._keys(phone)[:1], args=[self._hash(phone, str(code).strip()), self.max_attempts])
+        if result != 1:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                detail=VERIFY_ERRORS.get(result, "Geçersiz OTP kodu"))
+
+
+otp_store = OtpStore(
+    settings.REDIS_URL,
+    length=settings.OTP_LENGTH,
+    ttl=settings.OTP_TTL_SECONDS,
+    max_attempts=settings.OTP_MAX_ATTEMPTS,
+    cooldown=settings.OTP_RESEND_COOLDOWN,
+    max_sends=settings.OTP_MAX_SENDS_PER_HOUR,
+)